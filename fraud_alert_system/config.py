@@ -0,0 +1,62 @@
+"""Configuration loading shared by the fraud engine and the priority manager."""
+import yaml
+import os
+
+
+# Used when config.yaml is missing
+_DEFAULT_CONFIG = {
+    'rules': {
+        'high_amount': {'threshold': 5000, 'enabled': True},
+        'velocity': {'threshold': 5, 'time_window_hours': 1, 'enabled': True},
+        'geo_jump': {'time_window_hours': 2, 'enabled': True},
+        'device_sharing': {'threshold': 3, 'time_window_days': 7, 'enabled': True},
+        'unusual_time': {'start_hour': 2, 'end_hour': 5, 'enabled': True},
+        'suspicious_merchant': {'high_risk_mcc_codes': ['7995', '7273', '5967', '5912'], 'enabled': True}
+    },
+    'rule_weights': {
+        'HIGH_AMOUNT': 30,
+        'VELOCITY': 25,
+        'GEO_JUMP': 20,
+        'DEVICE_SHARING': 15,
+        'UNUSUAL_TIME': 10,
+        'SUSPICIOUS_MERCHANT': 15,
+        'DEFAULT': 5
+    },
+    'severity_thresholds': {
+        'CRITICAL': 80,
+        'HIGH': 60,
+        'MEDIUM': 40,
+        'LOW': 0
+    },
+    'sla_thresholds': {
+        'CRITICAL': 15,
+        'HIGH': 60,
+        'MEDIUM': 240,
+        'LOW': 1440
+    },
+    'priority_calculation': {
+        'risk_score_weight': 0.6,
+        'age_penalty_weight': 0.4,
+        'max_priority_score': 100,
+        'age_penalty_before_sla_max': 40,
+        'age_penalty_after_sla_max': 60
+    }
+}
+
+
+def load_config():
+    """Load configuration from config.yaml file."""
+    config_path = os.path.join(os.path.dirname(__file__), '..', 'config.yaml')
+    if not os.path.exists(config_path):
+        # Return default config if file doesn't exist
+        return _DEFAULT_CONFIG
+    
+    with open(config_path, 'r') as f:
+        return yaml.safe_load(f)
+
+
+def get_config():
+    """Get cached config or load it."""
+    if not hasattr(get_config, '_config'):
+        get_config._config = load_config()
+    return get_config._config
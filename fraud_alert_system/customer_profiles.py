@@ -1,89 +1,135 @@
 """Customer risk profile and investigation context utilities."""
 from fraud_alert_system.database import get_session, Transaction, Alert
 from datetime import datetime, timedelta
-from sqlalchemy import func
+from sqlalchemy import case, distinct, func, select
 
 
-def get_customer_risk_profile(customer_id, session):
+def get_customer_risk_profile(customer_id, session=None, alert_limit=10, transaction_limit=20):
     """
     Get comprehensive risk profile for a customer.
-    Returns aggregated risk information.
+    Returns aggregated risk information; recent alerts and transactions
+    are row tuples of the projected columns.
+    Without a session, a short-lived one is opened and closed here.
     """
-    # Get all transactions for this customer
-    transactions = session.query(Transaction).filter(
-        Transaction.customer_id == customer_id
-    ).order_by(Transaction.transaction_date.desc()).all()
+    if session is None:
+        session = get_session()
+        try:
+            return get_customer_risk_profile(customer_id, session, alert_limit, transaction_limit)
+        finally:
+            session.close()
     
-    # Get all alerts for this customer
-    alerts = session.query(Alert).join(Transaction).filter(
+    return build_customer_risk_profile(
+        customer_id,
+        get_profile_transaction_stats(customer_id, session),
+        get_profile_alert_stats(customer_id, session),
+        get_profile_transactions(customer_id, session, limit=transaction_limit),
+        get_profile_alerts(customer_id, session, limit=alert_limit)
+    )
+
+
+def get_profile_transactions(customer_id, session, limit=20):
+    """Get a customer's most recent transactions (only the columns the profile uses)."""
+    return session.query(
+        Transaction.transaction_id, Transaction.merchant, Transaction.amount,
+        Transaction.transaction_date, Transaction.city, Transaction.country,
+        Transaction.device_id
+    ).filter(
         Transaction.customer_id == customer_id
-    ).order_by(Alert.created_at.desc()).all()
+    ).order_by(Transaction.transaction_date.desc()).limit(limit).all()
+
+
+def get_profile_alerts(customer_id, session, limit=10):
+    """Get a customer's most recent alerts (only the columns the profile uses)."""
+    return session.query(
+        Alert.alert_id, Alert.severity, Alert.risk_score, Alert.status, Alert.created_at
+    ).join(Transaction).filter(
+        Transaction.customer_id == customer_id
+    ).order_by(Alert.created_at.desc()).limit(limit).all()
+
+
+def get_profile_transaction_stats(customer_id, session):
+    """
+    Aggregate a customer's transaction statistics in a single SQL query.
+    Sums are None when the customer has no transactions.
+    """
+    is_recent = Transaction.transaction_date >= datetime.utcnow() - timedelta(days=7)
+    # Distinct (city, country) pairs, counted over a subquery so no two pairs can merge;
+    # like device IDs, empty and missing cities are not counted
+    locations = select(Transaction.city, Transaction.country).where(
+        Transaction.customer_id == customer_id, Transaction.city != ''
+    ).distinct().subquery()
+    return session.query(
+        func.count(Transaction.id).label('total_transactions'),
+        func.sum(Transaction.amount).label('total_amount'),
+        func.max(Transaction.amount).label('max_amount'),
+        func.sum(case((is_recent, 1), else_=0)).label('recent_count'),
+        func.sum(case((is_recent, Transaction.amount), else_=0)).label('recent_amount'),
+        select(func.count()).select_from(locations).scalar_subquery().label('unique_locations'),
+        func.count(distinct(case((Transaction.device_id != '', Transaction.device_id)))).label('unique_devices')
+    ).filter(Transaction.customer_id == customer_id).one()
+
+
+def get_profile_alert_stats(customer_id, session):
+    """Get a customer's alert count, risk score sum and max risk score per (severity, status)."""
+    return session.query(
+        Alert.severity, Alert.status,
+        func.count(Alert.id).label('count'),
+        func.sum(Alert.risk_score).label('risk_sum'),
+        func.max(Alert.risk_score).label('risk_max')
+    ).join(Transaction).filter(
+        Transaction.customer_id == customer_id
+    ).group_by(Alert.severity, Alert.status).all()
+
+
+def build_customer_risk_profile(customer_id, transaction_stats, alert_stats, transactions, alerts):
+    """
+    Assemble a customer's risk profile from the aggregate rows and the
+    recent transaction and alert rows.
+    """
+    total_alerts = sum(row.count for row in alert_stats)
     
     # Calculate aggregated risk score
-    if alerts:
-        avg_risk_score = sum(a.risk_score for a in alerts) / len(alerts)
-        max_risk_score = max(a.risk_score for a in alerts)
+    if total_alerts:
+        avg_risk_score = sum(row.risk_sum or 0 for row in alert_stats) / total_alerts
+        max_risk_score = max(row.risk_max or 0 for row in alert_stats)
     else:
         avg_risk_score = 0
         max_risk_score = 0
     
     # Get alert counts by severity
-    severity_counts = {
-        'CRITICAL': len([a for a in alerts if a.severity == 'CRITICAL']),
-        'HIGH': len([a for a in alerts if a.severity == 'HIGH']),
-        'MEDIUM': len([a for a in alerts if a.severity == 'MEDIUM']),
-        'LOW': len([a for a in alerts if a.severity == 'LOW'])
-    }
+    severity_counts = {'CRITICAL': 0, 'HIGH': 0, 'MEDIUM': 0, 'LOW': 0}
     
     # Get alert counts by status
-    status_counts = {
-        'OPEN': len([a for a in alerts if a.status == 'OPEN']),
-        'RESOLVED': len([a for a in alerts if a.status == 'RESOLVED']),
-        'DISMISSED': len([a for a in alerts if a.status == 'DISMISSED']),
-        'ESCALATED': len([a for a in alerts if a.status == 'ESCALATED'])
-    }
-    
-    # Transaction statistics
-    if transactions:
-        total_amount = sum(t.amount for t in transactions)
-        avg_amount = total_amount / len(transactions)
-        max_amount = max(t.amount for t in transactions)
-        
-        # Recent activity (last 7 days)
-        recent_date = datetime.utcnow() - timedelta(days=7)
-        recent_transactions = [t for t in transactions if t.transaction_date >= recent_date]
-        recent_count = len(recent_transactions)
-        recent_amount = sum(t.amount for t in recent_transactions)
-    else:
-        total_amount = 0
-        avg_amount = 0
-        max_amount = 0
-        recent_count = 0
-        recent_amount = 0
+    status_counts = {'OPEN': 0, 'RESOLVED': 0, 'DISMISSED': 0, 'ESCALATED': 0}
     
-    # Unique locations
-    unique_locations = len(set((t.city, t.country) for t in transactions if t.city))
+    for row in alert_stats:
+        if row.severity in severity_counts:
+            severity_counts[row.severity] += row.count
+        if row.status in status_counts:
+            status_counts[row.status] += row.count
     
-    # Unique devices
-    unique_devices = len(set(t.device_id for t in transactions if t.device_id))
+    # Transaction statistics
+    total_transactions = transaction_stats.total_transactions
+    total_amount = transaction_stats.total_amount or 0
+    avg_amount = total_amount / total_transactions if total_transactions else 0
     
     return {
         'customer_id': customer_id,
-        'total_transactions': len(transactions),
-        'total_alerts': len(alerts),
+        'total_transactions': total_transactions,
+        'total_alerts': total_alerts,
         'avg_risk_score': round(avg_risk_score, 1),
         'max_risk_score': round(max_risk_score, 1),
         'severity_counts': severity_counts,
         'status_counts': status_counts,
         'total_amount': round(total_amount, 2),
         'avg_amount': round(avg_amount, 2),
-        'max_amount': round(max_amount, 2),
-        'recent_count': recent_count,
-        'recent_amount': round(recent_amount, 2),
-        'unique_locations': unique_locations,
-        'unique_devices': unique_devices,
-        'alerts': alerts[:10],  # Last 10 alerts
-        'transactions': transactions[:20]  # Last 20 transactions
+        'max_amount': round(transaction_stats.max_amount or 0, 2),
+        'recent_count': transaction_stats.recent_count or 0,
+        'recent_amount': round(transaction_stats.recent_amount or 0, 2),
+        'unique_locations': transaction_stats.unique_locations,
+        'unique_devices': transaction_stats.unique_devices,
+        'alerts': alerts,  # Most recent alerts
+        'transactions': transactions  # Most recent transactions
     }
 
 
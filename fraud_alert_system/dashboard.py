@@ -1,26 +1,41 @@
 """Streamlit dashboard for fraud alert management."""
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from fraud_alert_system.database import get_session, Alert, Transaction, AuditLog, create_database
+from fraud_alert_system.database import (
+    get_engine, Alert, AlertNote, Transaction, AuditLog, create_database
+)
 from fraud_alert_system.priority_manager import (
-    calculate_priority_score, get_sla_status, get_time_to_sla, sort_alerts_by_priority
+    calculate_priority_scores, get_sla_statuses, get_times_to_sla,
+    past_sla_condition
+)
+from fraud_alert_system.customer_profiles import (
+    build_customer_risk_profile, get_profile_alert_stats, get_profile_alerts,
+    get_profile_transaction_stats, get_profile_transactions
 )
-from fraud_alert_system.customer_profiles import get_customer_risk_profile
-from fraud_alert_system.data_generator import generate_transactions, save_transactions_to_csv
-from fraud_alert_system.ingestion import load_transactions_from_csv
+from fraud_alert_system.data_generator import generate_transactions
+from fraud_alert_system.ingestion import load_transactions_from_dataframe
 from fraud_alert_system.fraud_engine import FraudDetectionEngine
+from collections import Counter, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from sqlalchemy import func, and_, or_
+from sqlalchemy import func, and_, or_, insert, select
+from sqlalchemy.orm import joinedload, scoped_session, sessionmaker
+import atexit
+import html
+import math
+import queue
+import re
+import threading
+import time
+import traceback
 import uuid
-import os
 
 
-# Custom CSS for professional styling
-def load_custom_css():
-    """Load custom CSS styling for professional appearance."""
-    st.markdown("""
+# Custom CSS for professional styling, built once at import
+CUSTOM_CSS_SOURCE = """
     <style>
         /* Main styling */
         .main {
@@ -241,92 +256,208 @@ def load_custom_css():
             box-shadow: 0 6px 12px rgba(0, 0, 0, 0.15);
         }
     </style>
-    """, unsafe_allow_html=True)
+    """
+# Minified once at import: comments dropped and whitespace collapsed
+CUSTOM_CSS_HTML = re.sub(r'\s+', ' ', re.sub(r'/\*.*?\*/', '', CUSTOM_CSS_SOURCE, flags=re.S)).strip()
 
 
-def get_severity_badge_html(severity):
-    """Get HTML badge for severity."""
-    badge_class = {
-        'CRITICAL': 'badge-critical',
-        'HIGH': 'badge-high',
-        'MEDIUM': 'badge-medium',
-        'LOW': 'badge-low'
-    }.get(severity, 'badge')
-    return f'<span class="badge {badge_class}">{severity}</span>'
+def load_custom_css():
+    """
+    Load custom CSS styling for professional appearance.
+    Emitted on every run, since Streamlit drops any element a rerun does not
+    redraw; only the string itself is built once.
+    """
+    st.markdown(CUSTOM_CSS_HTML, unsafe_allow_html=True)
 
 
-def get_status_badge_html(status):
-    """Get HTML badge for status."""
-    badge_class = {
-        'OPEN': 'badge-open',
-        'RESOLVED': 'badge-resolved',
-        'ESCALATED': 'badge-escalated',
-        'DISMISSED': 'badge-dismissed',
-        'REVIEWING': 'badge-reviewing'
-    }.get(status, 'badge')
-    return f'<span class="badge {badge_class}">{status}</span>'
+class BadgeHTML(dict):
+    """Badge HTML keyed by value; values without a badge style get a plain badge."""
+
+    def __missing__(self, value):
+        return f'<span class="badge badge">{value}</span>'
+
+
+# Badge HTML, built once at import
+SEVERITY_BADGES = BadgeHTML({
+    severity: f'<span class="badge badge-{severity.lower()}">{severity}</span>'
+    for severity in ('CRITICAL', 'HIGH', 'MEDIUM', 'LOW')
+})
+STATUS_BADGES = BadgeHTML({
+    status: f'<span class="badge badge-{status.lower()}">{status}</span>'
+    for status in ('OPEN', 'RESOLVED', 'ESCALATED', 'DISMISSED', 'REVIEWING')
+})
+SLA_BADGE_TEMPLATES = {
+    'PAST_SLA': '<span class="badge badge-sla-critical">🔴 Past SLA ({minutes} min)</span>',
+    'APPROACHING_SLA': '<span class="badge badge-sla-warning">🟡 {minutes} min to SLA</span>',
+    'OK': '<span class="badge badge-sla-ok">🟢 OK ({minutes} min)</span>'
+}
+
+
+# HTML badge for a severity / status: a plain dict lookup
+get_severity_badge_html = SEVERITY_BADGES.__getitem__
+get_status_badge_html = STATUS_BADGES.__getitem__
 
 
 def get_sla_badge_html(sla_status, time_to_sla):
     """Get HTML badge for SLA status."""
+    minutes = int(time_to_sla)
     if sla_status == 'PAST_SLA':
-        return f'<span class="badge badge-sla-critical">🔴 Past SLA ({abs(int(time_to_sla))} min)</span>'
-    elif sla_status == 'APPROACHING_SLA':
-        return f'<span class="badge badge-sla-warning">🟡 {int(time_to_sla)} min to SLA</span>'
-    else:
-        return f'<span class="badge badge-sla-ok">🟢 OK ({int(time_to_sla)} min)</span>'
+        minutes = abs(minutes)
+    return SLA_BADGE_TEMPLATES.get(sla_status, SLA_BADGE_TEMPLATES['OK']).format(minutes=minutes)
+
+
+@st.cache_resource(show_spinner=False)
+def get_session_factory():
+    """
+    Create the database engine and session factory once per server process,
+    so reruns reuse its connection pool instead of building a new engine.
+    """
+    return scoped_session(sessionmaker(bind=get_engine()))
+
+
+def get_session():
+    """
+    Get this thread's database session from the shared session factory.
+    Every part of one script run gets the same session; main() removes it
+    when the run ends, so callers use it without closing it.
+    """
+    return get_session_factory()()
+
+
+def build_audit_values(alert_id, analyst_id, action, details=None):
+    """Build the column values of an audit log entry for an analyst action."""
+    return {
+        'log_id': 'LOG' + uuid.uuid4().hex[:12].upper(),
+        'alert_id': alert_id,
+        'analyst_id': analyst_id,
+        'action': action,
+        'details': details,
+        'timestamp': datetime.utcnow()
+    }
+
+
+def build_audit_entry(alert_id, analyst_id, action, details=None):
+    """Build an audit log entry for an analyst action."""
+    return AuditLog(**build_audit_values(alert_id, analyst_id, action, details))
+
+
+# Audit entries waiting for the background writer
+_audit_queue = queue.Queue()
+AUDIT_FLUSH_INTERVAL = 0.5  # seconds
+
+
+def flush_audit_queue(session_factory):
+    """Insert every queued audit entry with a single executemany and commit."""
+    entries = []
+    while True:
+        try:
+            entries.append(_audit_queue.get_nowait())
+        except queue.Empty:
+            break
+    
+    if entries:
+        session = session_factory()
+        try:
+            session.execute(insert(AuditLog), entries)
+            session.commit()
+        finally:
+            session_factory.remove()
+
+
+@st.cache_resource(show_spinner=False)
+def start_audit_writer():
+    """
+    Start the background thread that writes queued audit entries, once per
+    server process. Whatever is still queued at exit is flushed then.
+    """
+    session_factory = get_session_factory()
+    
+    def run():
+        while True:
+            time.sleep(AUDIT_FLUSH_INTERVAL)
+            try:
+                flush_audit_queue(session_factory)
+            except Exception:
+                traceback.print_exc()
+    
+    threading.Thread(target=run, name="audit-writer", daemon=True).start()
+    atexit.register(flush_audit_queue, session_factory)
+    return True
 
 
 def log_audit_action(alert_id, analyst_id, action, details=None):
-    """Log an analyst action to audit log."""
+    """
+    Log an analyst action to audit log.
+    The entry is queued and written by the background writer, so the page
+    never waits on the insert and commit.
+    """
+    start_audit_writer()
+    _audit_queue.put(build_audit_values(alert_id, analyst_id, action, details))
+
+
+def select_alert_from_table(alert_ids):
+    """Point the alert detail selector at the row picked in the queue table."""
+    rows = st.session_state.alerts_tbl.selection.rows
+    if rows:
+        st.session_state.alert_selector = alert_ids[rows[0]]
+
+
+# Alert actions offered in the investigation form: label -> (new status, audit details)
+ALERT_ACTIONS = {
+    "🚨 Escalate": ('ESCALATED', "Alert escalated"),
+    "✅ Resolve": ('RESOLVED', "Alert resolved"),
+    "❌ Dismiss": ('DISMISSED', "Alert dismissed as false positive"),
+    "📝 Reviewing": ('REVIEWING', "Alert set to reviewing status"),
+}
+
+
+def apply_alert_action(alert_id, analyst_id):
+    """
+    Apply the action chosen in the alert actions form.
+    Runs as the form submit callback, so the status change and its audit
+    entry are committed in one transaction before the page re-renders.
+    """
+    status, details = ALERT_ACTIONS[st.session_state.alert_action]
     session = get_session()
     try:
-        log_entry = AuditLog(
-            log_id='LOG' + str(uuid.uuid4()).replace('-', '').upper()[:12],
-            alert_id=alert_id,
-            analyst_id=analyst_id,
-            action=action,
-            details=details,
-            timestamp=datetime.utcnow()
-        )
-        session.add(log_entry)
-        session.commit()
+        alert = session.query(Alert).filter(Alert.alert_id == alert_id).first()
+        if alert:
+            alert.status = status
+            alert.analyst_id = analyst_id
+            if status == 'RESOLVED':
+                alert.resolved_at = datetime.utcnow()
+            session.add(build_audit_entry(alert_id, analyst_id, status, details))
+            session.commit()
+            mark_analytics_dirty()
+            st.session_state.alert_action_message = f"✅ Alert {alert_id} set to {status}"
     except Exception as e:
         session.rollback()
-        st.error(f"Error logging action: {e}")
-    finally:
-        session.close()
+        st.error(f"Error updating alert: {e}")
 
 
 def perform_bulk_action(session, alert_ids, action, analyst_id, details=""):
-    """Perform bulk action on multiple alerts."""
-    alerts = session.query(Alert).filter(Alert.alert_id.in_(alert_ids)).all()
-    action_count = 0
+    """
+    Perform bulk action on multiple alerts.
+    All alerts are changed by a single UPDATE and their audit entries are
+    added to the same transaction, so the whole batch is one commit.
+    """
+    if action == "DISMISS":
+        values, log_action = {Alert.status: 'DISMISSED'}, "DISMISSED"
+    elif action == "RESOLVE":
+        values, log_action = {Alert.status: 'RESOLVED', Alert.resolved_at: datetime.utcnow()}, "RESOLVED"
+    elif action == "ASSIGN":
+        values, log_action = {}, "ASSIGNED"
+    else:
+        return 0
+    
+    # Always update analyst_id when taking action
+    values[Alert.analyst_id] = analyst_id
+    log_details = f"Bulk action: {details}" if details else f"Bulk {action}"
     
     try:
-        for alert in alerts:
-            if action == "DISMISS":
-                alert.status = 'DISMISSED'
-                log_action = "DISMISSED"
-            elif action == "RESOLVE":
-                alert.status = 'RESOLVED'
-                alert.resolved_at = datetime.utcnow()
-                log_action = "RESOLVED"
-            elif action == "ASSIGN":
-                alert.analyst_id = analyst_id
-                log_action = "ASSIGNED"
-            else:
-                continue
-            
-            # Always update analyst_id when taking action
-            alert.analyst_id = analyst_id
-            
-            # Log the action
-            log_audit_action(alert.alert_id, analyst_id, log_action, 
-                            f"Bulk action: {details}" if details else f"Bulk {action}")
-            action_count += 1
-        
-        # Commit all changes at once (more efficient)
+        matched_ids = [alert_id for (alert_id,) in session.query(Alert.alert_id).filter(Alert.alert_id.in_(alert_ids))]
+        session.query(Alert).filter(Alert.alert_id.in_(matched_ids)).update(values, synchronize_session=False)
+        session.add_all([build_audit_entry(alert_id, analyst_id, log_action, log_details) for alert_id in matched_ids])
         session.commit()
         
         # Refresh the session to ensure objects are updated
@@ -336,7 +467,57 @@ def perform_bulk_action(session, alert_ids, action, analyst_id, details=""):
         session.rollback()
         raise e
     
-    return action_count
+    return len(matched_ids)
+
+
+# Static page fragments, built once instead of per render
+SPACER_HTML = "<br>"
+FOOTER_CAPTION = "Fraud Alert Management Simulator | Portfolio Prototype by Kunaal | 2025"
+
+
+# Tables larger than this skip pandas Styler (per-cell CSS dominates render time)
+STYLED_TABLE_MAX_ROWS = 50
+
+# Alert queue and audit trail are fetched one page at a time (LIMIT/OFFSET)
+QUEUE_PAGE_SIZES = [20, 50, 100]
+AUDIT_TRAIL_PAGE = 20
+
+
+# Customer profile tables grow by one page per "Load more" click, up to a hard cap
+PROFILE_ALERTS_PAGE = 10
+PROFILE_TRANSACTIONS_PAGE = 20
+PROFILE_MAX_ROWS = 200
+
+# Profile tables up to this many rows render as a static st.table
+SMALL_TABLE_MAX_ROWS = 5
+
+
+# Alert queue table labels for SLA status and severity
+SLA_INDICATORS = {
+    'PAST_SLA': "🔴 Past SLA",
+    'APPROACHING_SLA': "🟡 Warning"
+}
+SEVERITY_EMOJI = {
+    'CRITICAL': '🔴',
+    'HIGH': '🟠',
+    'MEDIUM': '🔵',
+    'LOW': '🟢'
+}
+
+
+# Statuses still awaiting analyst work, the only ones that can breach SLA
+ACTIVE_STATUSES = ('OPEN', 'REVIEWING')
+
+
+# Plain alert queue rows and overview counts, safe to keep in st.cache_data
+AlertRow = namedtuple('AlertRow', ['alert_id', 'severity', 'risk_score', 'status', 'created_at'])
+QueueMetrics = namedtuple('QueueMetrics', [
+    'total_alerts', 'open_alerts', 'resolved_alerts', 'critical_alerts', 'high_alerts',
+    'medium_alerts', 'low_alerts', 'escalated_alerts', 'past_sla'
+])
+AnalyticsData = namedtuple('AnalyticsData', [
+    'total_alerts', 'severity_counts', 'status_counts', 'daily_counts', 'top_merchants'
+])
 
 
 # Default analyst credentials (simplified for demo)
@@ -355,48 +536,464 @@ def authenticate_user(username, password):
     return False, None
 
 
-def initialize_sample_data_if_needed():
-    """Initialize sample data if database is empty (for new deployments)."""
-    session = get_session()
+def seed_sample_data():
+    """Generate sample transactions, load them and run the fraud engine over them."""
+    df = generate_transactions(num_transactions=500, days_back=30)
+    
+    # Load transactions into database straight from memory
+    load_transactions_from_dataframe(df)
+    
+    # Run fraud detection engine
+    engine = FraudDetectionEngine()
     try:
-        # Check if database has any transactions
-        transaction_count = session.query(Transaction).count()
-        
-        if transaction_count == 0:
-            # Database is empty - generate sample data
-            with st.spinner('🔄 Initializing sample data (first run only)...'):
-                # Generate transactions
-                df = generate_transactions(num_transactions=500, days_back=30)
-                
-                # Save to temporary CSV file
-                temp_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
-                os.makedirs(temp_dir, exist_ok=True)
-                csv_path = os.path.join(temp_dir, 'temp_transactions.csv')
-                save_transactions_to_csv(df, csv_path)
-                
-                # Load transactions into database
-                load_transactions_from_csv(csv_path)
-                
-                # Run fraud detection engine
-                engine = FraudDetectionEngine()
-                try:
-                    alerts_generated = engine.process_transactions()
-                    st.success(f'✅ Initialized database with {len(df)} transactions and {alerts_generated} alerts!')
-                finally:
-                    engine.close()
-                
-                # Clean up temp file
-                if os.path.exists(csv_path):
-                    os.remove(csv_path)
-        # If transaction_count > 0, database already has data, skip initialization
+        return len(df), engine.process_transactions()
+    finally:
+        engine.close()
+
+
+@st.cache_resource(show_spinner=False)
+def initialize_database():
+    """
+    Create missing tables and indexes once per server process; create_database
+    checks every index, which is wasted work on each rerun.
+    """
+    return create_database()
+
+
+@st.cache_resource(show_spinner=False)
+def start_sample_data_seeding():
+    """
+    Start seed_sample_data on a background thread, once per server process.
+    Returns its future; the page keeps rendering while it runs.
+    """
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="sample-data").submit(seed_sample_data)
+
+
+@st.fragment(run_every=2)
+def show_sample_data_progress(seeding):
+    """Report background seeding; rerun the whole app with fresh data once it finishes."""
+    if not seeding.done():
+        st.info('🔄 Initializing sample data in the background (first run only)...')
+        return
+    
+    initialize_sample_data_if_needed._done = True
+    try:
+        transactions_loaded, alerts_generated = seeding.result()
     except Exception as e:
         # If initialization fails, log error but don't block the app
         st.warning(f'⚠️ Could not initialize sample data: {e}')
-    finally:
-        session.close()
+        return
+    
+    st.toast(f'✅ Initialized database with {transactions_loaded} transactions and {alerts_generated} alerts!')
+    load_alert_queue.clear()
+    build_analytics_frames.clear()
+    load_customer_profile.clear()
+    st.rerun()
+
+
+def initialize_sample_data_if_needed():
+    """
+    Initialize sample data if database is empty (for new deployments).
+    Checked once per server process, not once per browser session; the
+    seeding itself runs in the background (see start_sample_data_seeding).
+    """
+    if getattr(initialize_sample_data_if_needed, '_done', False):
+        return
+    
+    seeding = getattr(initialize_sample_data_if_needed, '_seeding', None)
+    if seeding is None:
+        session = get_session()
+        try:
+            # Check if database has any transactions (existence only, no full count)
+            if session.query(Transaction.id).first() is not None:
+                # If the database already has data, skip initialization
+                initialize_sample_data_if_needed._done = True
+                return
+        except Exception as e:
+            # If initialization fails, log error but don't block the app
+            st.warning(f'⚠️ Could not initialize sample data: {e}')
+            return
+        finally:
+            session.close()
+        
+        # Database is empty - generate sample data
+        seeding = initialize_sample_data_if_needed._seeding = start_sample_data_seeding()
+    
+    show_sample_data_progress(seeding)
+
+
+def build_alert_query(session, status_filter, severity_filter, date_range, merchant_filter, analyst_filter):
+    """Build the alert queue query (alerts joined to transactions) with the sidebar filters applied."""
+    query = session.query(Alert).join(Transaction, Alert.transaction_id == Transaction.transaction_id)
+    
+    if status_filter:
+        query = query.filter(Alert.status.in_(status_filter))
+    
+    if severity_filter:
+        query = query.filter(Alert.severity.in_(severity_filter))
+    
+    if len(date_range) == 2:
+        start_date, end_date = date_range
+        # Ensure we include the full end date (up to end of day)
+        # Add one day to end_date and subtract 1 second to get end of the selected day
+        start_datetime = datetime.combine(start_date, datetime.min.time())
+        end_datetime = datetime.combine(end_date, datetime.max.time()) + timedelta(microseconds=999999)
+        query = query.filter(
+            and_(
+                Alert.created_at >= start_datetime,
+                Alert.created_at <= end_datetime
+            )
+        )
+    
+    # Apply merchant filter
+    if merchant_filter:
+        query = query.filter(Transaction.merchant.in_(merchant_filter))
+    
+    # Apply analyst filter
+    if analyst_filter:
+        if "Unassigned" in analyst_filter:
+            # Include both unassigned and specific analysts
+            analyst_list = [a for a in analyst_filter if a != "Unassigned"]
+            if analyst_list:
+                query = query.filter(or_(Alert.analyst_id.is_(None), Alert.analyst_id.in_(analyst_list)))
+            else:
+                query = query.filter(Alert.analyst_id.is_(None))
+        else:
+            query = query.filter(Alert.analyst_id.in_(analyst_filter))
+    
+    return query
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def build_analytics_frames(status_filter, severity_filter, date_range, merchant_filter, analyst_filter):
+    """
+    Build the analytics chart inputs for the current filters as AnalyticsData,
+    each count a GROUP BY over the filtered query; cleared by mark_analytics_dirty.
+    """
+    session = get_session()
+    query = build_alert_query(
+        session, status_filter, severity_filter, date_range, merchant_filter, analyst_filter
+    )
+    alert_count = func.count(Alert.id)
+    
+    # Severity and status counts from one (severity, status) grouping
+    severity_counts = Counter()
+    status_counts = Counter()
+    for severity, status, count in query.with_entities(
+        Alert.severity, Alert.status, alert_count
+    ).group_by(Alert.severity, Alert.status):
+        severity_counts[severity] += count
+        status_counts[status] += count
+    
+    # Alerts per day
+    alert_day = func.date(Alert.created_at)
+    daily_rows = query.with_entities(alert_day, alert_count).group_by(alert_day).order_by(alert_day).all()
+    
+    # Top merchants by alert count, aggregated in SQL over the same filtered query
+    top_merchants = list(map(tuple, query.with_entities(
+        Transaction.merchant, alert_count
+    ).group_by(Transaction.merchant).order_by(alert_count.desc()).limit(10)))
+    
+    return AnalyticsData(
+        total_alerts=sum(status_counts.values()),
+        severity_counts=pd.Series(dict(severity_counts.most_common()), dtype='int64'),
+        status_counts=pd.Series(dict(status_counts.most_common()), dtype='int64'),
+        daily_counts=pd.Series(
+            [count for _, count in daily_rows],
+            index=pd.to_datetime([day for day, _ in daily_rows]),
+            dtype='int64'
+        ),
+        top_merchants=top_merchants
+    )
+
+
+# Analytics figures, cached per input so unchanged data skips Plotly's figure construction
+@st.cache_data(max_entries=32, show_spinner=False)
+def make_severity_pie(severity_counts):
+    """Severity distribution pie chart."""
+    fig = px.pie(
+        values=severity_counts.values,
+        names=severity_counts.index,
+        color_discrete_sequence=['#ef4444', '#f59e0b', '#3b82f6', '#10b981'],  # Red, Orange, Blue, Green
+        hole=0.3
+    )
+    fig.update_layout(
+        showlegend=True,
+        font=dict(color='#1e293b', size=12),
+        margin=dict(l=0, r=0, t=0, b=0)
+    )
+    return fig
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def make_merchant_bar(top_merchants):
+    """Horizontal bar chart of (merchant, alert count) pairs, largest at top."""
+    merchant_names, merchant_counts = zip(*reversed(top_merchants))
+    fig = go.Figure(go.Bar(
+        x=merchant_counts,
+        y=merchant_names,
+        orientation='h',
+        marker_color='#1e3a8a'
+    ))
+    fig.update_layout(
+        xaxis_title="Alert Count",
+        yaxis_title="",
+        height=300,
+        font=dict(color='#1e293b', size=11),
+        margin=dict(l=0, r=0, t=0, b=0)
+    )
+    return fig
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def make_time_line(daily_counts):
+    """Area line chart of alerts per day."""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=daily_counts.index,
+        y=daily_counts.values,
+        mode='lines+markers',
+        fill='tonexty' if len(daily_counts) > 1 else 'tozeroy',
+        fillcolor='rgba(30, 58, 138, 0.2)',
+        line=dict(color='#1e3a8a', width=3),
+        marker=dict(color='#1e3a8a', size=8)
+    ))
+    fig.update_layout(
+        xaxis_title="Date",
+        yaxis_title="Alert Count",
+        height=300,
+        font=dict(color='#1e293b', size=11),
+        margin=dict(l=0, r=0, t=0, b=0),
+        hovermode='x unified',
+        xaxis=dict(type='date'),
+        showlegend=False
+    )
+    return fig
+
+
+@st.cache_data(ttl=30, show_spinner="Loading alerts...")
+def load_alert_queue(status_filter, severity_filter, date_range, merchant_filter, analyst_filter,
+                     sort_option, page=1, page_size=QUEUE_PAGE_SIZES[0]):
+    """
+    Load one page of the sorted alert queue and the overview metrics for the
+    current filters.
+    Cached per filter set like build_analytics_frames; alerts are returned
+    as AlertRow tuples so the cached value holds no SQLAlchemy objects.
+    Returns (alerts on the page, QueueMetrics over all matches).
+    """
+    offset = (page - 1) * page_size
+    session = get_session()
+    query = build_alert_query(
+        session, status_filter, severity_filter, date_range, merchant_filter, analyst_filter
+    )
+    rows = query.with_entities(
+        Alert.alert_id, Alert.severity, Alert.risk_score, Alert.status, Alert.created_at
+    )
+    
+    # Sort and page in SQL; priority depends on alert age, so it is scored
+    # in one NumPy pass and only the requested page is kept
+    if sort_option == "Priority (Highest First)":
+        frame = pd.read_sql(rows.statement, session.bind, parse_dates=['created_at'])
+        scores = calculate_priority_scores(frame['severity'], frame['risk_score'], frame['created_at'])
+        top = np.argsort(-scores, kind='stable')[offset:offset + page_size]
+        alerts = [AlertRow._make(row) for row in frame.iloc[top].itertuples(index=False)]
+    else:
+        if sort_option == "Risk Score (Highest)":
+            rows = rows.order_by(Alert.risk_score.desc())
+        elif sort_option == "Created Date (Newest)":
+            rows = rows.order_by(Alert.created_at.desc())
+        elif sort_option == "Created Date (Oldest)":
+            rows = rows.order_by(Alert.created_at)
+        alerts = [AlertRow._make(row) for row in rows.limit(page_size).offset(offset)]
+    
+    # Metrics cover ALL matching alerts, counted in SQL
+    severity_counts = Counter()
+    status_counts = Counter()
+    for severity, status, count in query.with_entities(
+        Alert.severity, Alert.status, func.count(Alert.id)
+    ).group_by(Alert.severity, Alert.status):
+        severity_counts[severity] += count
+        status_counts[status] += count
+    
+    # Only active alerts can be past SLA; skip the query when none matched
+    if any(status_counts[status] for status in ACTIVE_STATUSES):
+        past_sla = query.filter(Alert.status.in_(ACTIVE_STATUSES), past_sla_condition()).count()
+    else:
+        past_sla = 0
+    
+    # Resolved and escalated counts ignore the status filter, so they are
+    # shown regardless of which statuses are selected
+    base_query = build_alert_query(
+        session, None, severity_filter, date_range, merchant_filter, analyst_filter
+    )
+    unfiltered_status_counts = dict(base_query.with_entities(
+        Alert.status, func.count(Alert.id)
+    ).filter(Alert.status.in_(['RESOLVED', 'ESCALATED'])).group_by(Alert.status).all())
+    
+    metrics = QueueMetrics(
+        total_alerts=sum(status_counts.values()),
+        open_alerts=status_counts['OPEN'],
+        resolved_alerts=unfiltered_status_counts.get('RESOLVED', 0),
+        critical_alerts=severity_counts['CRITICAL'],
+        high_alerts=severity_counts['HIGH'],
+        medium_alerts=severity_counts['MEDIUM'],
+        low_alerts=severity_counts['LOW'],
+        escalated_alerts=unfiltered_status_counts.get('ESCALATED', 0),
+        past_sla=past_sla
+    )
+    
+    return alerts, metrics
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_customer_profile(customer_id, pages=1):
+    """
+    Load a customer's risk profile as plain data, with `pages` pages of
+    recent alerts and transactions.
+    Only a string and an int form the cache key; the session is taken inside,
+    so Streamlit never hashes SQLAlchemy objects.
+    The four small queries run one after another on this run's session (the
+    result is cached, and a thread pool would cost more than the queries).
+    Rows are converted to plain tuples so the cached value holds no
+    SQLAlchemy objects.
+    """
+    session = get_session()
+    return build_customer_risk_profile(
+        customer_id,
+        get_profile_transaction_stats(customer_id, session),
+        get_profile_alert_stats(customer_id, session),
+        list(map(tuple, get_profile_transactions(
+            customer_id, session, limit=min(PROFILE_TRANSACTIONS_PAGE * pages, PROFILE_MAX_ROWS)
+        ))),
+        list(map(tuple, get_profile_alerts(
+            customer_id, session, limit=min(PROFILE_ALERTS_PAGE * pages, PROFILE_MAX_ROWS)
+        )))
+    )
+
+
+def derive_alert_sla(alerts):
+    """
+    Priority score, SLA status, minutes to SLA and age in minutes for each
+    AlertRow, indexed by alert ID. Computed once per render, column-wise with one "now", and
+    shared by the queue table and the alert detail view.
+    """
+    raw = pd.DataFrame.from_records(alerts, columns=AlertRow._fields, nrows=len(alerts))
+    created_at = raw['created_at'].astype('datetime64[ns]')
+    now = datetime.utcnow()
+    return pd.DataFrame({
+        'priority': calculate_priority_scores(raw['severity'], raw['risk_score'], created_at, now),
+        'sla_status': get_sla_statuses(raw['severity'], created_at, now),
+        'time_to_sla': get_times_to_sla(raw['severity'], created_at, now),
+        'age_minutes': (now - created_at).dt.total_seconds() / 60
+    }).set_index(raw['alert_id'])
+
+
+def build_alert_queue_frame(alerts, derived):
+    """Build the alert queue table from AlertRow tuples and their derive_alert_sla values."""
+    raw = pd.DataFrame.from_records(alerts, columns=AlertRow._fields, nrows=len(alerts))
+    return pd.DataFrame({
+        'Alert ID': raw['alert_id'].astype('string[pyarrow]'),
+        'Severity': (raw['severity'].map(SEVERITY_EMOJI).fillna('⚪') + ' ' + raw['severity']).astype('category'),
+        'Risk Score': raw['risk_score'].astype('float32'),
+        'Priority': derived['priority'].to_numpy(dtype='float32'),
+        'SLA': derived['sla_status'].map(SLA_INDICATORS).fillna("🟢 OK").astype('category').to_numpy(),
+        'Time to SLA': derived['time_to_sla'].round().astype('int32').to_numpy(),
+        'Status': raw['status'].astype('category'),
+        'Created': raw['created_at'].astype('datetime64[ns]')
+    })
+
+
+def show_profile_table(df, column_config, formatters):
+    """
+    Show a customer profile table indexed by its ID column.
+    Tiny tables go through st.table with pre-formatted columns, skipping the
+    virtualized grid; larger ones use st.dataframe with frontend formatting.
+    """
+    if len(df) <= SMALL_TABLE_MAX_ROWS:
+        st.table(df.assign(**{col: fmt(df[col]) for col, fmt in formatters.items()}))
+    else:
+        st.dataframe(df, use_container_width=True, height=400, column_config=column_config)
+
+
+@st.fragment
+def render_profile_alerts_panel(alerts, total_alerts):
+    """Show a customer's recent alerts; as a fragment it reruns on its own."""
+    st.markdown(
+        f"{SPACER_HTML}\n\n#### 🚨 Recent Alerts (showing {len(alerts)} of {total_alerts})",
+        unsafe_allow_html=True
+    )
+    alert_df = pd.DataFrame.from_records(
+        alerts,
+        columns=['alert_id', 'severity', 'risk_score', 'status', 'created_at']
+    ).astype({
+        'alert_id': 'string[pyarrow]', 'severity': 'category', 'risk_score': 'float32',
+        'status': 'category', 'created_at': 'datetime64[ns]'
+    }).rename(columns={
+        'alert_id': 'Alert ID', 'severity': 'Severity', 'risk_score': 'Risk Score',
+        'status': 'Status', 'created_at': 'Created'
+    })
+    show_profile_table(
+        alert_df.set_index('Alert ID'),
+        column_config={
+            'Risk Score': st.column_config.NumberColumn(format="%.1f"),
+            'Created': st.column_config.DatetimeColumn(format="YYYY-MM-DD HH:mm:ss")
+        },
+        formatters={
+            'Risk Score': lambda col: col.map('{:.1f}'.format),
+            'Created': lambda col: col.dt.strftime('%Y-%m-%d %H:%M:%S')
+        }
+    )
+
+
+@st.fragment
+def render_profile_transactions_panel(transactions, total_transactions):
+    """Show a customer's recent transactions; as a fragment it reruns on its own."""
+    st.markdown(
+        f"{SPACER_HTML}\n\n#### 💳 Recent Transactions (showing {len(transactions)} of {total_transactions})",
+        unsafe_allow_html=True
+    )
+    txn_df = pd.DataFrame.from_records(
+        transactions,
+        columns=['transaction_id', 'merchant', 'amount', 'transaction_date',
+                 'city', 'country', 'device_id']
+    ).astype({
+        'transaction_id': 'string[pyarrow]', 'amount': 'float64',
+        'transaction_date': 'datetime64[ns]'
+    }).rename(columns={
+        'transaction_id': 'Transaction ID', 'merchant': 'Merchant', 'amount': 'Amount',
+        'transaction_date': 'Date', 'device_id': 'Device'
+    })
+    location = txn_df.pop('city').astype(str) + ', ' + txn_df.pop('country').astype(str)
+    txn_df.insert(4, 'Location', location)
+    show_profile_table(
+        txn_df.set_index('Transaction ID'),
+        column_config={
+            'Amount': st.column_config.NumberColumn(format="$%.2f"),
+            'Date': st.column_config.DatetimeColumn(format="YYYY-MM-DD HH:mm:ss")
+        },
+        formatters={
+            'Amount': lambda col: col.map('${:,.2f}'.format),
+            'Date': lambda col: col.dt.strftime('%Y-%m-%d %H:%M:%S')
+        }
+    )
+
+
+def mark_analytics_dirty():
+    """Invalidate the process-wide cached queue and analytics after an analyst action changes alert data."""
+    load_alert_queue.clear()
+    build_analytics_frames.clear()
+    load_customer_profile.clear()
 
 
 def main():
+    try:
+        render_dashboard()
+    finally:
+        # End of the script run: release this run's scoped session
+        get_session_factory().remove()
+
+
+def render_dashboard():
     st.set_page_config(
         page_title="FraudOps Alert Management",
         page_icon="🔒",
@@ -407,18 +1004,15 @@ def main():
     # Initialize database - ensure tables exist (idempotent operation)
     # This is critical for Streamlit Cloud deployments where the database may not exist
     try:
-        create_database()
+        initialize_database()
     except Exception as e:
         st.error(f"❌ Error initializing database: {e}")
-        import traceback
         st.code(traceback.format_exc())
         return
     
     # Initialize sample data if database is empty (for new deployments)
     # Only runs once when database is first created
-    if 'data_initialized' not in st.session_state:
-        initialize_sample_data_if_needed()
-        st.session_state.data_initialized = True
+    initialize_sample_data_if_needed()
     
     # Load custom CSS
     load_custom_css()
@@ -454,7 +1048,7 @@ def main():
         
         # Footer
         st.markdown("<hr>", unsafe_allow_html=True)
-        st.caption("Fraud Alert Management Simulator | Portfolio Prototype by Kunaal | 2025")
+        st.caption(FOOTER_CAPTION)
         return
     
     # User is authenticated - show main dashboard
@@ -527,8 +1121,6 @@ def main():
         except Exception:
             available_merchants = []
             available_analysts = []
-        finally:
-            temp_session.close()
         
         if available_merchants:
             merchant_filter = st.multiselect(
@@ -554,6 +1146,20 @@ def main():
             key="sort_option"
         )
         
+        page_size = st.selectbox(
+            "Rows per page",
+            QUEUE_PAGE_SIZES,
+            key="queue_page_size",
+            help="Alerts fetched and shown per page of the alert table"
+        )
+        page = st.number_input("Page", min_value=1, step=1, key="queue_page")
+        
+        color_rows = st.checkbox(
+            "Color rows",
+            value=True,
+            help=f"Color-code severity and SLA in the alert table (tables over {STYLED_TABLE_MAX_ROWS} rows are shown plain)"
+        )
+        
         st.divider()
         st.caption("**Version:** 2.0.0")
         st.caption("**Last Updated:** " + datetime.now().strftime("%Y-%m-%d"))
@@ -561,635 +1167,456 @@ def main():
     # Main content area - Title appears only once
     st.title("🔒 FraudOps Alert Management System")
     
-    session = get_session()
-    
-    try:
-        if view_mode == "Alert Queue":
-            # Initialize variable outside spinner block
-            all_alerts_for_analytics = []
-            
-            # Build query with loading spinner
-            with st.spinner('Loading alerts...'):
-                query = session.query(Alert).join(Transaction)
-                
-                if status_filter:
-                    query = query.filter(Alert.status.in_(status_filter))
-                
-                if severity_filter:
-                    query = query.filter(Alert.severity.in_(severity_filter))
-                
-                if len(date_range) == 2:
-                    start_date, end_date = date_range
-                    # Ensure we include the full end date (up to end of day)
-                    # Add one day to end_date and subtract 1 second to get end of the selected day
-                    start_datetime = datetime.combine(start_date, datetime.min.time())
-                    end_datetime = datetime.combine(end_date, datetime.max.time()) + timedelta(microseconds=999999)
-                    query = query.filter(
-                        and_(
-                            Alert.created_at >= start_datetime,
-                            Alert.created_at <= end_datetime
-                        )
-                    )
-                
-                # Apply merchant filter
-                if merchant_filter:
-                    query = query.filter(Transaction.merchant.in_(merchant_filter))
-                
-                # Apply analyst filter
-                if analyst_filter:
-                    if "Unassigned" in analyst_filter:
-                        # Include both unassigned and specific analysts
-                        analyst_list = [a for a in analyst_filter if a != "Unassigned"]
-                        if analyst_list:
-                            query = query.filter(or_(Alert.analyst_id.is_(None), Alert.analyst_id.in_(analyst_list)))
-                        else:
-                            query = query.filter(Alert.analyst_id.is_(None))
-                    else:
-                        query = query.filter(Alert.analyst_id.in_(analyst_filter))
-                
-                alerts = query.all()
-                
-                # Sort alerts based on option
-                if sort_option == "Priority (Highest First)":
-                    alerts = sort_alerts_by_priority(alerts)
-                elif sort_option == "Risk Score (Highest)":
-                    alerts = sorted(alerts, key=lambda x: x.risk_score, reverse=True)
-                elif sort_option == "Created Date (Newest)":
-                    alerts = sorted(alerts, key=lambda x: x.created_at, reverse=True)
-                elif sort_option == "Created Date (Oldest)":
-                    alerts = sorted(alerts, key=lambda x: x.created_at)
-                
-                # Store all alerts for analytics (before limiting for table display)
-                all_alerts_for_analytics = alerts.copy()
-                
-                # Limit to realistic demo size (top 20) for table display only
-                alerts = alerts[:20]
-            
-            st.success(f"Loaded {len(all_alerts_for_analytics)} alerts (showing top 20 in table)")
-            
-            st.divider()
-            st.subheader("📈 Dashboard Overview")
-            
-            # Calculate metrics from ALL matching alerts, not just the limited top 20
-            # This ensures metrics reflect the true state of all filtered alerts
-            metrics_alerts = all_alerts_for_analytics if all_alerts_for_analytics else alerts
-            
-            # For resolved and escalated counts, we need to query ALL alerts that match OTHER filters
-            # (not status filter, since we want to show counts regardless of status filter)
-            def build_base_query():
-                """Build base query with all filters except status filter."""
-                base_query = session.query(Alert).join(Transaction)
-                
-                # Apply all filters EXCEPT status filter
-                if severity_filter:
-                    base_query = base_query.filter(Alert.severity.in_(severity_filter))
-                
-                if len(date_range) == 2:
-                    start_date, end_date = date_range
-                    base_query = base_query.filter(
-                        and_(
-                            Alert.created_at >= datetime.combine(start_date, datetime.min.time()),
-                            Alert.created_at <= datetime.combine(end_date, datetime.max.time())
-                        )
+    with get_session() as session:
+        try:
+            if view_mode == "Alert Queue":
+                alerts, metrics = load_alert_queue(
+                    status_filter, severity_filter, date_range, merchant_filter, analyst_filter,
+                    sort_option, page, page_size
+                )
+                # A page past the end (e.g. after narrowing the filters) shows the last page
+                page_count = max(1, math.ceil(metrics.total_alerts / page_size))
+                if page > page_count:
+                    page = page_count
+                    alerts, metrics = load_alert_queue(
+                        status_filter, severity_filter, date_range, merchant_filter, analyst_filter,
+                        sort_option, page, page_size
                     )
                 
-                if merchant_filter:
-                    base_query = base_query.filter(Transaction.merchant.in_(merchant_filter))
-                
-                if analyst_filter:
-                    if "Unassigned" in analyst_filter:
-                        analyst_list = [a for a in analyst_filter if a != "Unassigned"]
-                        if analyst_list:
-                            base_query = base_query.filter(or_(Alert.analyst_id.is_(None), Alert.analyst_id.in_(analyst_list)))
-                        else:
-                            base_query = base_query.filter(Alert.analyst_id.is_(None))
-                    else:
-                        base_query = base_query.filter(Alert.analyst_id.in_(analyst_filter))
-                
-                return base_query
-            
-            # Count resolved and escalated alerts (ignoring status filter)
-            try:
-                base_query = build_base_query()
-                resolved_alerts = base_query.filter(Alert.status == 'RESOLVED').count()
-                escalated_alerts = base_query.filter(Alert.status == 'ESCALATED').count()
-            except Exception as e:
-                # Fallback to filtered list if query fails
-                resolved_alerts = len([a for a in metrics_alerts if a.status == 'RESOLVED'])
-                escalated_alerts = len([a for a in metrics_alerts if a.status == 'ESCALATED'])
-            
-            # Calculate other metrics from filtered alerts
-            total_alerts = len(metrics_alerts)
-            open_alerts = len([a for a in metrics_alerts if a.status == 'OPEN'])
-            critical_alerts = len([a for a in metrics_alerts if a.severity == 'CRITICAL'])
-            high_alerts = len([a for a in metrics_alerts if a.severity == 'HIGH'])
-            medium_alerts = len([a for a in metrics_alerts if a.severity == 'MEDIUM'])
-            low_alerts = len([a for a in metrics_alerts if a.severity == 'LOW'])
-            past_sla = len([a for a in metrics_alerts if get_sla_status(a) == 'PAST_SLA' and a.status in ['OPEN', 'REVIEWING']])
-            
-            # Group 1: Overall Metrics
-            st.markdown("#### Overall Status")
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("Total Alerts", f"{total_alerts:,}", delta=None)
-                st.caption("ℹ️ Total alerts matching current filters")
-            with col2:
-                st.metric("Open Alerts", f"{open_alerts:,}", 
-                         delta=f"-{total_alerts - open_alerts}" if total_alerts > open_alerts else None)
-                st.caption("ℹ️ Alerts not yet resolved or dismissed")
-            with col3:
-                st.metric("Resolved", f"{resolved_alerts:,}", delta=None)
-                st.caption("ℹ️ Alerts that have been resolved")
-            
-            # Group 2: Severity Breakdown
-            st.markdown("#### Severity Breakdown")
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                st.markdown('<div style="background-color: #fee2e2; padding: 10px; border-radius: 5px; border-left: 4px solid #dc2626;">', unsafe_allow_html=True)
-                st.metric("🔴 Critical", critical_alerts, 
-                         delta="⚠️ Urgent" if critical_alerts > 0 else None,
-                         delta_color="inverse" if critical_alerts > 0 else "normal")
-                st.caption("ℹ️ Highest risk - immediate action required")
-                st.markdown('</div>', unsafe_allow_html=True)
-            with col2:
-                st.markdown('<div style="background-color: #fef3c7; padding: 10px; border-radius: 5px; border-left: 4px solid #f59e0b;">', unsafe_allow_html=True)
-                st.metric("🟠 High", high_alerts, delta=None)
-                st.caption("ℹ️ High risk - review within 4 hours")
-                st.markdown('</div>', unsafe_allow_html=True)
-            with col3:
-                st.markdown('<div style="background-color: #dbeafe; padding: 10px; border-radius: 5px; border-left: 4px solid #3b82f6;">', unsafe_allow_html=True)
-                st.metric("🔵 Medium", medium_alerts, delta=None)
-                st.caption("ℹ️ Moderate risk - review within 24 hours")
-                st.markdown('</div>', unsafe_allow_html=True)
-            with col4:
-                st.markdown('<div style="background-color: #d1fae5; padding: 10px; border-radius: 5px; border-left: 4px solid #10b981;">', unsafe_allow_html=True)
-                st.metric("🟢 Low", low_alerts, delta=None)
-                st.caption("ℹ️ Low risk - review within 48 hours")
-                st.markdown('</div>', unsafe_allow_html=True)
-            
-            # Group 3: Action Required
-            st.markdown("#### Action Required")
-            col1, col2 = st.columns(2)
-            with col1:
-                st.metric("Escalated", escalated_alerts, delta=None)
-                st.caption("ℹ️ Alerts requiring higher-level review")
-            with col2:
-                st.metric("Past SLA", past_sla, 
-                         delta="🚨 Action Required" if past_sla > 0 else None,
-                         delta_color="inverse" if past_sla > 0 else "normal")
-                st.caption("ℹ️ Alerts older than 24 hours (SLA breached)")
-            
-            st.divider()
-            
-            # Bulk Operations Section
-            if alerts:
-                st.subheader("⚡ Bulk Operations")
-                st.markdown('<div class="info-box">💡 <strong>Tip:</strong> Select multiple alerts below, then use bulk actions to process them efficiently.</div>', 
-                          unsafe_allow_html=True)
+                first_row = (page - 1) * page_size
+                st.success(
+                    f"Loaded {metrics.total_alerts} alerts (showing {first_row + 1 if alerts else 0}-"
+                    f"{first_row + len(alerts)} in table, page {page} of {page_count})"
+                )
                 
-                col1, col2, col3 = st.columns([1, 1, 1])
+                st.divider()
+                st.subheader("📈 Dashboard Overview")
                 
+                # Group 1: Overall Metrics
+                st.markdown("#### Overall Status")
+                col1, col2, col3 = st.columns(3)
                 with col1:
-                    if st.button("✅ Resolve Selected", key="bulk_resolve", use_container_width=True):
-                        if 'selected_alerts' in st.session_state and st.session_state.selected_alerts:
-                            count = perform_bulk_action(session, st.session_state.selected_alerts, 
-                                                       "RESOLVE", analyst_id, "Bulk resolve")
-                            st.success(f"✅ Successfully resolved {count} alert(s)!")
-                            st.session_state.selected_alerts = []
-                            st.rerun()
-                        else:
-                            st.warning("Please select at least one alert first.")
-                
+                    st.metric("Total Alerts", f"{metrics.total_alerts:,}", delta=None)
+                    st.caption("ℹ️ Total alerts matching current filters")
                 with col2:
-                    if st.button("❌ Dismiss Selected", key="bulk_dismiss", use_container_width=True):
-                        if 'selected_alerts' in st.session_state and st.session_state.selected_alerts:
-                            count = perform_bulk_action(session, st.session_state.selected_alerts, 
-                                                       "DISMISS", analyst_id, "Bulk dismiss as false positive")
-                            st.success(f"❌ Successfully dismissed {count} alert(s) as false positives!")
-                            st.session_state.selected_alerts = []
-                            st.rerun()
-                        else:
-                            st.warning("Please select at least one alert first.")
-                
+                    st.metric("Open Alerts", f"{metrics.open_alerts:,}", 
+                             delta=f"-{metrics.total_alerts - metrics.open_alerts}" if metrics.total_alerts > metrics.open_alerts else None)
+                    st.caption("ℹ️ Alerts not yet resolved or dismissed")
                 with col3:
-                    if 'selected_alerts' in st.session_state and st.session_state.selected_alerts:
-                        st.info(f"📌 **{len(st.session_state.selected_alerts)}** alert(s) selected")
-            
-            st.divider()
-            
-            # Alert list - Minimal core columns
-            if not alerts:
-                st.info("ℹ️ No alerts found matching the current filters. Try adjusting your filter criteria.")
-            else:
-                st.subheader(f"🚨 Alert Queue ({len(alerts)} alerts)")
-                st.caption(f"Sorted by: {sort_option}")
-                
-                # Initialize selected alerts in session state
-                if 'selected_alerts' not in st.session_state:
-                    st.session_state.selected_alerts = []
+                    st.metric("Resolved", f"{metrics.resolved_alerts:,}", delta=None)
+                    st.caption("ℹ️ Alerts that have been resolved")
                 
-                # Multi-select for bulk operations
-                alert_options = {f"{a.alert_id} | {a.severity} | Risk: {a.risk_score:.1f}": a.alert_id 
-                                for a in alerts}
-                selected_alert_labels = st.multiselect(
-                    "Select alerts for bulk operations:",
-                    options=list(alert_options.keys()),
-                    default=[label for label in alert_options.keys() 
-                             if alert_options[label] in st.session_state.selected_alerts],
-                    key="bulk_select"
-                )
-                st.session_state.selected_alerts = [alert_options[label] for label in selected_alert_labels]
-                
-                # Minimal core columns only with enhanced colors
-                alert_data = []
-                for alert in alerts:
-                    sla_status = get_sla_status(alert)
-                    priority_score = calculate_priority_score(alert)
-                    time_to_sla = get_time_to_sla(alert)
-                    
-                    # Enhanced SLA indicator with colors
-                    if sla_status == 'PAST_SLA':
-                        sla_indicator = "🔴 Past SLA"
-                        sla_color = "#dc2626"  # Red
-                    elif sla_status == 'APPROACHING_SLA':
-                        sla_indicator = "🟡 Warning"
-                        sla_color = "#f59e0b"  # Orange
-                    else:
-                        sla_indicator = "🟢 OK"
-                        sla_color = "#10b981"  # Green
-                    
-                    # Color-coded severity
-                    severity_emoji = {
-                        'CRITICAL': '🔴',
-                        'HIGH': '🟠',
-                        'MEDIUM': '🔵',
-                        'LOW': '🟢'
-                    }.get(alert.severity, '⚪')
-                    
-                    alert_data.append({
-                        'Alert ID': alert.alert_id,
-                        'Severity': f"{severity_emoji} {alert.severity}",
-                        'Risk Score': f"{alert.risk_score:.1f}",
-                        'Priority': f"{priority_score:.1f}",
-                        'SLA': sla_indicator,
-                        'Status': alert.status,
-                        'Created': alert.created_at.strftime('%Y-%m-%d %H:%M')
-                    })
-                
-                df_alerts = pd.DataFrame(alert_data)
+                # Group 2: Severity Breakdown
+                st.markdown("#### Severity Breakdown")
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.markdown('<div style="background-color: #fee2e2; padding: 10px; border-radius: 5px; border-left: 4px solid #dc2626;">', unsafe_allow_html=True)
+                    st.metric("🔴 Critical", metrics.critical_alerts, 
+                             delta="⚠️ Urgent" if metrics.critical_alerts > 0 else None,
+                             delta_color="inverse" if metrics.critical_alerts > 0 else "normal")
+                    st.caption("ℹ️ Highest risk - immediate action required")
+                    st.markdown('</div>', unsafe_allow_html=True)
+                with col2:
+                    st.markdown('<div style="background-color: #fef3c7; padding: 10px; border-radius: 5px; border-left: 4px solid #f59e0b;">', unsafe_allow_html=True)
+                    st.metric("🟠 High", metrics.high_alerts, delta=None)
+                    st.caption("ℹ️ High risk - review within 4 hours")
+                    st.markdown('</div>', unsafe_allow_html=True)
+                with col3:
+                    st.markdown('<div style="background-color: #dbeafe; padding: 10px; border-radius: 5px; border-left: 4px solid #3b82f6;">', unsafe_allow_html=True)
+                    st.metric("🔵 Medium", metrics.medium_alerts, delta=None)
+                    st.caption("ℹ️ Moderate risk - review within 24 hours")
+                    st.markdown('</div>', unsafe_allow_html=True)
+                with col4:
+                    st.markdown('<div style="background-color: #d1fae5; padding: 10px; border-radius: 5px; border-left: 4px solid #10b981;">', unsafe_allow_html=True)
+                    st.metric("🟢 Low", metrics.low_alerts, delta=None)
+                    st.caption("ℹ️ Low risk - review within 48 hours")
+                    st.markdown('</div>', unsafe_allow_html=True)
                 
-                # Display table with enhanced styling using pandas Styler
-                try:
-                    # Create styled dataframe with color coding
-                    def color_severity(val):
-                        val_str = str(val).upper()
-                        if 'CRITICAL' in val_str:
-                            return 'background-color: #fee2e2; color: #991b1b; font-weight: bold'
-                        elif 'HIGH' in val_str:
-                            return 'background-color: #fef3c7; color: #92400e; font-weight: bold'
-                        elif 'MEDIUM' in val_str:
-                            return 'background-color: #dbeafe; color: #1e40af'
-                        elif 'LOW' in val_str:
-                            return 'background-color: #d1fae5; color: #065f46'
-                        return ''
-                    
-                    def color_sla(val):
-                        val_str = str(val).upper()
-                        if 'PAST SLA' in val_str or '🔴' in str(val):
-                            return 'background-color: #fee2e2; color: #991b1b; font-weight: bold'
-                        elif 'WARNING' in val_str or '🟡' in str(val):
-                            return 'background-color: #fef3c7; color: #92400e'
-                        elif 'OK' in val_str or '🟢' in str(val):
-                            return 'background-color: #d1fae5; color: #065f46'
-                        return ''
-                    
-                    # Use map instead of applymap for newer pandas versions
-                    try:
-                        styled_df = (df_alerts.style
-                                    .map(color_severity, subset=['Severity'])
-                                    .map(color_sla, subset=['SLA']))
-                    except AttributeError:
-                        # Fallback for older pandas versions
-                        styled_df = (df_alerts.style
-                                    .applymap(color_severity, subset=['Severity'])
-                                    .applymap(color_sla, subset=['SLA']))
-                    
-                    st.dataframe(styled_df, use_container_width=True, hide_index=True, height=300)
-                except Exception:
-                    # Fallback to unstyled dataframe if styling fails
-                    st.dataframe(df_alerts, use_container_width=True, hide_index=True, height=300)
+                # Group 3: Action Required
+                st.markdown("#### Action Required")
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.metric("Escalated", metrics.escalated_alerts, delta=None)
+                    st.caption("ℹ️ Alerts requiring higher-level review")
+                with col2:
+                    st.metric("Past SLA", metrics.past_sla, 
+                             delta="🚨 Action Required" if metrics.past_sla > 0 else None,
+                             delta_color="inverse" if metrics.past_sla > 0 else "normal")
+                    st.caption("ℹ️ Alerts older than 24 hours (SLA breached)")
                 
                 st.divider()
                 
-                # Alert detail view with expandable panels
-                st.subheader("🔍 Alert Investigation")
-                
-                alert_ids = [a.alert_id for a in alerts]
-                selected_alert_id = st.selectbox(
-                    "Select Alert to View Details:",
-                    alert_ids,
-                    key="alert_selector"
-                )
+                # Queue and analytics live in separate tabs; the analytics frames are
+                # cached, so actions in the queue tab do not recompute the charts
+                queue_tab, analytics_tab = st.tabs(["🚨 Alert Queue", "📊 Analytics Dashboard"])
                 
-                if selected_alert_id:
-                    with st.spinner('Loading alert details...'):
-                        alert = session.query(Alert).filter(Alert.alert_id == selected_alert_id).first()
-                    
-                    if alert:
-                        # Log view action
-                        log_audit_action(selected_alert_id, analyst_id, "VIEWED", "Alert details viewed")
+                with queue_tab:
+                    # Bulk Operations Section
+                    if alerts:
+                        st.subheader("⚡ Bulk Operations")
+                        # Selected alert IDs, kept as a set for O(1) membership checks
+                        st.session_state.setdefault('selected_alerts', set())
+                        st.markdown('<div class="info-box">💡 <strong>Tip:</strong> Select multiple alerts below, then use bulk actions to process them efficiently.</div>', 
+                                  unsafe_allow_html=True)
+                        
+                        col1, col2, col3 = st.columns([1, 1, 1])
                         
-                        # Quick action buttons at top
-                        col1, col2, col3, col4 = st.columns(4)
                         with col1:
-                            if st.button("🚨 Escalate", key="escalate", use_container_width=True):
-                                with st.spinner('Escalating alert...'):
-                                    alert.status = 'ESCALATED'
-                                    alert.analyst_id = analyst_id
-                                    session.commit()
-                                    log_audit_action(selected_alert_id, analyst_id, "ESCALATED", "Alert escalated")
-                                st.success("✅ Alert escalated successfully!")
-                                st.rerun()
+                            if st.button("✅ Resolve Selected", key="bulk_resolve", use_container_width=True):
+                                if st.session_state.selected_alerts:
+                                    count = perform_bulk_action(session, st.session_state.selected_alerts, 
+                                                               "RESOLVE", analyst_id, "Bulk resolve")
+                                    st.success(f"✅ Successfully resolved {count} alert(s)!")
+                                    st.session_state.selected_alerts = set()
+                                    mark_analytics_dirty()
+                                    st.rerun()
+                                else:
+                                    st.warning("Please select at least one alert first.")
                         
                         with col2:
-                            if st.button("✅ Resolve", key="resolve", use_container_width=True):
-                                with st.spinner('Resolving alert...'):
-                                    alert.status = 'RESOLVED'
-                                    alert.resolved_at = datetime.utcnow()
-                                    alert.analyst_id = analyst_id
-                                    session.commit()
-                                    log_audit_action(selected_alert_id, analyst_id, "RESOLVED", "Alert resolved")
-                                st.success("✅ Alert resolved successfully!")
-                                st.rerun()
+                            if st.button("❌ Dismiss Selected", key="bulk_dismiss", use_container_width=True):
+                                if st.session_state.selected_alerts:
+                                    count = perform_bulk_action(session, st.session_state.selected_alerts, 
+                                                               "DISMISS", analyst_id, "Bulk dismiss as false positive")
+                                    st.success(f"❌ Successfully dismissed {count} alert(s) as false positives!")
+                                    st.session_state.selected_alerts = set()
+                                    mark_analytics_dirty()
+                                    st.rerun()
+                                else:
+                                    st.warning("Please select at least one alert first.")
                         
                         with col3:
-                            if st.button("❌ Dismiss", key="dismiss", use_container_width=True):
-                                with st.spinner('Dismissing alert...'):
-                                    alert.status = 'DISMISSED'
-                                    alert.analyst_id = analyst_id
-                                    session.commit()
-                                    log_audit_action(selected_alert_id, analyst_id, "DISMISSED", "Alert dismissed as false positive")
-                                st.success("✅ Alert dismissed successfully!")
-                                st.rerun()
+                            if st.session_state.selected_alerts:
+                                st.info(f"📌 **{len(st.session_state.selected_alerts)}** alert(s) selected")
+                    
+                    st.divider()
+                    
+                    # Alert list - Minimal core columns
+                    if not alerts:
+                        st.info("ℹ️ No alerts found matching the current filters. Try adjusting your filter criteria.")
+                    else:
+                        st.subheader(f"🚨 Alert Queue ({len(alerts)} alerts)")
+                        st.caption(f"Sorted by: {sort_option}")
                         
-                        with col4:
-                            if st.button("📝 Reviewing", key="reviewing", use_container_width=True):
-                                with st.spinner('Updating status...'):
-                                    alert.status = 'REVIEWING'
-                                    alert.analyst_id = analyst_id
-                                    session.commit()
-                                    log_audit_action(selected_alert_id, analyst_id, "REVIEWING", "Alert set to reviewing status")
-                                st.success("✅ Alert status updated!")
-                                st.rerun()
+                        # Multi-select for bulk operations
+                        alert_options = {f"{a.alert_id} | {a.severity} | Risk: {a.risk_score:.1f}": a.alert_id 
+                                        for a in alerts}
+                        selected_alert_labels = st.multiselect(
+                            "Select alerts for bulk operations:",
+                            options=list(alert_options.keys()),
+                            default=[label for label, alert_id in alert_options.items()
+                                     if alert_id in st.session_state.selected_alerts],
+                            key="bulk_select"
+                        )
+                        st.session_state.selected_alerts = {alert_options[label] for label in selected_alert_labels}
                         
-                        # Expandable panels for details
-                        with st.expander("📋 View Full Alert Details", expanded=False):
-                            col1, col2 = st.columns(2)
+                        # Minimal core columns only with enhanced colors
+                        alert_sla = derive_alert_sla(alerts)
+                        df_alerts = build_alert_queue_frame(alerts, alert_sla)
+                        queue_formats = {
+                            'Risk Score': '{:.1f}', 'Priority': '{:.1f}', 'Time to SLA': '{:d} min',
+                            'Created': '{:%Y-%m-%d %H:%M}'
+                        }
+                        queue_column_config = {
+                            'Risk Score': st.column_config.NumberColumn(format="%.1f"),
+                            'Priority': st.column_config.NumberColumn(format="%.1f"),
+                            'SLA': st.column_config.TextColumn(
+                                help="🔴 past the severity's SLA, 🟡 over 80% of it used, 🟢 on track"
+                            ),
+                            'Time to SLA': st.column_config.NumberColumn(
+                                format="%d min", help="Minutes left before the SLA deadline (negative once breached)"
+                            ),
+                            'Created': st.column_config.DatetimeColumn(format="YYYY-MM-DD HH:mm")
+                        }
                         
-                            with col1:
-                                priority_score = calculate_priority_score(alert)
-                                sla_status = get_sla_status(alert)
-                                time_to_sla = get_time_to_sla(alert)
+                        # Clicking a row selects that alert for the investigation panel below
+                        alert_ids = [a.alert_id for a in alerts]
+                        queue_table_options = dict(
+                            use_container_width=True, hide_index=True, height=300,
+                            column_config=queue_column_config, key='alerts_tbl',
+                            on_select=lambda: select_alert_from_table(alert_ids),
+                            selection_mode='single-row'
+                        )
+                        
+                        # Display table with enhanced styling using pandas Styler
+                        # (per-cell CSS only pays off for small tables)
+                        if color_rows and len(df_alerts) <= STYLED_TABLE_MAX_ROWS:
+                            try:
+                                # Create styled dataframe with color coding
+                                def color_severity(val):
+                                    val_str = str(val).upper()
+                                    if 'CRITICAL' in val_str:
+                                        return 'background-color: #fee2e2; color: #991b1b; font-weight: bold'
+                                    elif 'HIGH' in val_str:
+                                        return 'background-color: #fef3c7; color: #92400e; font-weight: bold'
+                                    elif 'MEDIUM' in val_str:
+                                        return 'background-color: #dbeafe; color: #1e40af'
+                                    elif 'LOW' in val_str:
+                                        return 'background-color: #d1fae5; color: #065f46'
+                                    return ''
                                 
-                                st.markdown(f"**Alert ID:** `{alert.alert_id}`")
-                                st.markdown(f"**Severity:** {get_severity_badge_html(alert.severity)}", unsafe_allow_html=True)
-                                st.markdown(f"**Risk Score:** {alert.risk_score:.1f} / 100")
-                                st.markdown(f"**Priority Score:** {priority_score:.1f} / 100")
-                                st.markdown(f"**SLA Status:** {get_sla_badge_html(sla_status, time_to_sla)}", unsafe_allow_html=True)
+                                def color_sla(val):
+                                    val_str = str(val).upper()
+                                    if 'PAST SLA' in val_str or '🔴' in str(val):
+                                        return 'background-color: #fee2e2; color: #991b1b; font-weight: bold'
+                                    elif 'WARNING' in val_str or '🟡' in str(val):
+                                        return 'background-color: #fef3c7; color: #92400e'
+                                    elif 'OK' in val_str or '🟢' in str(val):
+                                        return 'background-color: #d1fae5; color: #065f46'
+                                    return ''
                                 
-                                if time_to_sla < 0:
-                                    st.markdown(f"**Time Past SLA:** {abs(int(time_to_sla))} minutes")
-                                else:
-                                    st.markdown(f"**Time to SLA:** {int(time_to_sla)} minutes")
+                                # Use map instead of applymap for newer pandas versions
+                                try:
+                                    styled_df = (df_alerts.style
+                                                .map(color_severity, subset=['Severity'])
+                                                .map(color_sla, subset=['SLA'])
+                                                .format(queue_formats))
+                                except AttributeError:
+                                    # Fallback for older pandas versions
+                                    styled_df = (df_alerts.style
+                                                .applymap(color_severity, subset=['Severity'])
+                                                .applymap(color_sla, subset=['SLA'])
+                                                .format(queue_formats))
                                 
-                                st.markdown(f"**Status:** {get_status_badge_html(alert.status)}", unsafe_allow_html=True)
-                                st.markdown(f"**Rule Triggered:** `{alert.rule_triggered}`")
-                                st.markdown(f"**Created:** {alert.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
-                                st.markdown(f"**Age:** {(datetime.utcnow() - alert.created_at).total_seconds() / 60:.0f} minutes")
-                            
-                            # Get transaction details
-                            transaction = session.query(Transaction).filter(
-                                Transaction.transaction_id == alert.transaction_id
-                            ).first()
-                            
-                            with col2:
-                                if transaction:
-                                    st.markdown(f"**Transaction ID:** `{transaction.transaction_id}`")
-                                    st.markdown(f"**Customer ID:** `{transaction.customer_id}`")
-                                    st.markdown(f"**Merchant:** {transaction.merchant}")
-                                    st.markdown(f"**Amount:** ${transaction.amount:,.2f}")
-                                    st.markdown(f"**Date:** {transaction.transaction_date.strftime('%Y-%m-%d %H:%M:%S')}")
-                                    st.markdown(f"**Location:** {transaction.city}, {transaction.country}")
-                                    st.markdown(f"**Device ID:** `{transaction.device_id}`")
-                                    st.markdown(f"**IP Address:** `{transaction.ip_address}`")
-                                    st.markdown(f"**MCC Code:** `{transaction.mcc_code}`")
-                                    
-                                    if st.button("👤 View Customer Profile", key="view_customer", use_container_width=True):
-                                        st.session_state.customer_id_to_view = transaction.customer_id
-                                        st.session_state.view_mode = "Customer Profile"
-                                        st.rerun()
+                                st.dataframe(styled_df, **queue_table_options)
+                            except Exception:
+                                # Fallback to unstyled dataframe if styling fails
+                                st.dataframe(df_alerts, **queue_table_options)
+                        else:
+                            st.dataframe(df_alerts, **queue_table_options)
                         
-                        # Notes in expandable panel
-                        with st.expander("📝 View Alert Notes & Actions", expanded=False):
-                            st.markdown("**Alert Notes:**")
-                            st.info(alert.notes or "*No notes available for this alert.*")
-                            
-                            st.divider()
-                            st.markdown("**Add Note:**")
-                            new_note = st.text_area("Enter your notes here:", key="note_input", height=100,
-                                                  placeholder="Type your investigation notes, findings, or actions taken...")
-                            if st.button("💾 Save Note", key="save_note", use_container_width=True):
-                                if new_note.strip():
-                                    with st.spinner('Saving note...'):
-                                        if alert.notes:
-                                            alert.notes = alert.notes + "\n\n" + f"[{datetime.utcnow().strftime('%Y-%m-%d %H:%M')}] {new_note}"
-                                        else:
-                                            alert.notes = f"[{datetime.utcnow().strftime('%Y-%m-%d %H:%M')}] {new_note}"
-                                        session.commit()
-                                        log_audit_action(selected_alert_id, analyst_id, "NOTE_ADDED", new_note)
-                                    st.success("✅ Note saved successfully!")
-                                    st.rerun()
-                                else:
-                                    st.warning("Please enter a note before saving.")
+                        st.divider()
                         
-                        # Audit trail in expandable panel
-                        with st.expander("📜 View Audit Trail", expanded=False):
-                            audit_logs = session.query(AuditLog).filter(
-                                AuditLog.alert_id == selected_alert_id
-                            ).order_by(AuditLog.timestamp.desc()).all()
-                            
-                            if audit_logs:
-                                log_data = []
-                                for log in audit_logs:
-                                    log_data.append({
-                                        'Timestamp': log.timestamp.strftime('%Y-%m-%d %H:%M:%S'),
-                                        'Analyst': log.analyst_id,
-                                        'Action': log.action,
-                                        'Details': log.details or '-'
-                                    })
-                                st.dataframe(pd.DataFrame(log_data), use_container_width=True, hide_index=True)
-                            else:
-                                st.info("No audit log entries for this alert.")
-            
-            # Compact Charts Section
-            st.divider()
-            st.subheader("📊 Analytics Dashboard")
-            
-            # Use all alerts for analytics (not just the limited 20 for table)
-            # This ensures charts show full data, not just the 20 shown in the table
-            analytics_alerts = all_alerts_for_analytics if all_alerts_for_analytics else alerts
-            
-            if analytics_alerts:
-                # Prepare data for charts from ALL matching alerts
-                alert_df = pd.DataFrame([{
-                    'alert_id': a.alert_id,
-                    'severity': a.severity,
-                    'status': a.status,
-                    'risk_score': a.risk_score,
-                    'created_at': a.created_at,
-                    'transaction_id': a.transaction_id
-                } for a in analytics_alerts])
-                
-                # Get merchant information for each alert (use all alerts for analytics)
-                merchant_data = []
-                for alert in analytics_alerts:
-                    transaction = session.query(Transaction).filter(
-                        Transaction.transaction_id == alert.transaction_id
-                    ).first()
-                    if transaction:
-                        merchant_data.append({
-                            'merchant': transaction.merchant,
-                            'alert_id': alert.alert_id
-                        })
-                
-                merchant_df = pd.DataFrame(merchant_data) if merchant_data else pd.DataFrame()
-                
-                # Row 1: Severity Pie Chart and Status Chart
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    if not alert_df.empty:
-                        st.markdown("#### Alerts by Severity")
-                        severity_counts = alert_df['severity'].value_counts()
-                        # Create pie chart with professional colors
-                        fig_severity = px.pie(
-                            values=severity_counts.values,
-                            names=severity_counts.index,
-                            color_discrete_sequence=['#ef4444', '#f59e0b', '#3b82f6', '#10b981'],  # Red, Orange, Blue, Green
-                            hole=0.3
-                        )
-                        fig_severity.update_layout(
-                            showlegend=True,
-                            font=dict(color='#1e293b', size=12),
-                            margin=dict(l=0, r=0, t=0, b=0)
-                        )
-                        st.plotly_chart(fig_severity, use_container_width=True)
-                        st.caption("**Distribution by Severity Level**")
-                
-                with col2:
-                    if not alert_df.empty:
-                        st.markdown("#### Alerts by Status")
-                        status_counts = alert_df['status'].value_counts()
-                        status_df = pd.DataFrame({
-                            'Status': status_counts.index,
-                            'Count': status_counts.values
-                        })
-                        st.bar_chart(status_df.set_index('Status'))
-                        st.caption("**Distribution by Status**")
-                
-                # Row 2: Top Risky Merchants (Horizontal Bar) and Time Chart
-                st.divider()
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    if not merchant_df.empty:
-                        st.markdown("#### Top Risky Merchants")
-                        merchant_counts = merchant_df['merchant'].value_counts().head(10)
-                        # Create horizontal bar chart
-                        merchant_df_chart = pd.DataFrame({
-                            'Merchant': merchant_counts.index,
-                            'Alert Count': merchant_counts.values
-                        })
-                        # Sort for horizontal display (largest at top)
-                        merchant_df_chart = merchant_df_chart.sort_values('Alert Count', ascending=True)
+                        # Alert detail view with expandable panels
+                        st.subheader("🔍 Alert Investigation")
                         
-                        # Use plotly for horizontal bar chart
-                        fig_merchants = go.Figure(go.Bar(
-                            x=merchant_df_chart['Alert Count'],
-                            y=merchant_df_chart['Merchant'],
-                            orientation='h',
-                            marker_color='#1e3a8a'
-                        ))
-                        fig_merchants.update_layout(
-                            xaxis_title="Alert Count",
-                            yaxis_title="",
-                            height=300,
-                            font=dict(color='#1e293b', size=11),
-                            margin=dict(l=0, r=0, t=0, b=0)
+                        selected_alert_id = st.selectbox(
+                            "Select Alert to View Details (or click a row above):",
+                            alert_ids,
+                            key="alert_selector"
                         )
-                        st.plotly_chart(fig_merchants, use_container_width=True)
-                        st.caption("**Top 10 Merchants by Alert Count**")
-                    else:
-                        st.info("No merchant data available.")
+                        
+                        if selected_alert_id:
+                            with st.spinner('Loading alert details...'):
+                                # Load the transaction in the same SELECT; the detail panels read it
+                                alert = session.query(Alert).options(joinedload(Alert.transaction)).filter(
+                                    Alert.alert_id == selected_alert_id
+                                ).first()
+                            
+                            if alert:
+                                # Log view action once per selection, not on every rerun
+                                if st.session_state.get('last_viewed_alert') != selected_alert_id:
+                                    st.session_state.last_viewed_alert = selected_alert_id
+                                    log_audit_action(selected_alert_id, analyst_id, "VIEWED", "Alert details viewed")
+                                
+                                # Quick actions - one form so a single submit applies the change
+                                with st.form("alert_actions"):
+                                    st.radio(
+                                        "Action",
+                                        list(ALERT_ACTIONS.keys()),
+                                        key="alert_action",
+                                        horizontal=True,
+                                        label_visibility="collapsed"
+                                    )
+                                    st.form_submit_button(
+                                        "Apply Action",
+                                        use_container_width=True,
+                                        on_click=apply_alert_action,
+                                        args=(selected_alert_id, analyst_id)
+                                    )
+                                
+                                action_message = st.session_state.pop('alert_action_message', None)
+                                if action_message:
+                                    st.success(action_message)
+                                
+                                # Expandable panels for details
+                                with st.expander("📋 View Full Alert Details", expanded=False):
+                                    col1, col2 = st.columns(2)
+                                
+                                    with col1:
+                                        priority_score, sla_status, time_to_sla, age_minutes = alert_sla.loc[selected_alert_id]
+                                        
+                                        if time_to_sla < 0:
+                                            sla_time_html = f"<div><b>Time Past SLA:</b> {abs(int(time_to_sla))} minutes</div>"
+                                        else:
+                                            sla_time_html = f"<div><b>Time to SLA:</b> {int(time_to_sla)} minutes</div>"
+                                        
+                                        # One markdown element per column instead of one per field
+                                        st.markdown('\n'.join([
+                                            f"<div><b>Alert ID:</b> <code>{alert.alert_id}</code></div>",
+                                            f"<div><b>Severity:</b> {get_severity_badge_html(alert.severity)}</div>",
+                                            f"<div><b>Risk Score:</b> {alert.risk_score:.1f} / 100</div>",
+                                            f"<div><b>Priority Score:</b> {priority_score:.1f} / 100</div>",
+                                            f"<div><b>SLA Status:</b> {get_sla_badge_html(sla_status, time_to_sla)}</div>",
+                                            sla_time_html,
+                                            f"<div><b>Status:</b> {get_status_badge_html(alert.status)}</div>",
+                                            f"<div><b>Rule Triggered:</b> <code>{alert.rule_triggered}</code></div>",
+                                            f"<div><b>Created:</b> {alert.created_at.strftime('%Y-%m-%d %H:%M:%S')}</div>",
+                                            f"<div><b>Age:</b> {age_minutes:.0f} minutes</div>"
+                                        ]), unsafe_allow_html=True)
+                                    
+                                    # Get transaction details
+                                    transaction = alert.transaction
+                                    
+                                    with col2:
+                                        if transaction:
+                                            st.markdown('\n'.join([
+                                                f"<div><b>Transaction ID:</b> <code>{transaction.transaction_id}</code></div>",
+                                                f"<div><b>Customer ID:</b> <code>{transaction.customer_id}</code></div>",
+                                                f"<div><b>Merchant:</b> {html.escape(transaction.merchant)}</div>",
+                                                f"<div><b>Amount:</b> ${transaction.amount:,.2f}</div>",
+                                                f"<div><b>Date:</b> {transaction.transaction_date.strftime('%Y-%m-%d %H:%M:%S')}</div>",
+                                                f"<div><b>Location:</b> {html.escape(f'{transaction.city}, {transaction.country}')}</div>",
+                                                f"<div><b>Device ID:</b> <code>{transaction.device_id}</code></div>",
+                                                f"<div><b>IP Address:</b> <code>{transaction.ip_address}</code></div>",
+                                                f"<div><b>MCC Code:</b> <code>{transaction.mcc_code}</code></div>"
+                                            ]), unsafe_allow_html=True)
+                                            
+                                            if st.button("👤 View Customer Profile", key="view_customer", use_container_width=True):
+                                                st.session_state.customer_id_to_view = transaction.customer_id
+                                                st.session_state.view_mode = "Customer Profile"
+                                                st.rerun()
+                                
+                                # Notes in expandable panel
+                                with st.expander("📝 View Alert Notes & Actions", expanded=False):
+                                    st.markdown("**Alert Notes:**")
+                                    # Detection notes on the alert itself, then analyst notes in order
+                                    note_lines = [alert.notes] if alert.notes else []
+                                    note_lines += [
+                                        f"[{created_at:%Y-%m-%d %H:%M}] {note_text}"
+                                        for created_at, note_text in session.query(
+                                            AlertNote.created_at, AlertNote.note_text
+                                        ).filter(AlertNote.alert_id == selected_alert_id).order_by(AlertNote.created_at)
+                                    ]
+                                    st.info("\n\n".join(note_lines) or "*No notes available for this alert.*")
+                                    
+                                    st.divider()
+                                    st.markdown("**Add Note:**")
+                                    new_note = st.text_area("Enter your notes here:", key="note_input", height=100,
+                                                          placeholder="Type your investigation notes, findings, or actions taken...")
+                                    if st.button("💾 Save Note", key="save_note", use_container_width=True):
+                                        if new_note.strip():
+                                            with st.spinner('Saving note...'):
+                                                # Append-only insert: concurrent notes never overwrite each other
+                                                session.add(AlertNote(
+                                                    alert_id=selected_alert_id, analyst_id=analyst_id, note_text=new_note
+                                                ))
+                                                session.add(build_audit_entry(selected_alert_id, analyst_id, "NOTE_ADDED", new_note))
+                                                session.commit()
+                                            st.success("✅ Note saved successfully!")
+                                            st.rerun()
+                                        else:
+                                            st.warning("Please enter a note before saving.")
+                                
+                                # Audit trail in expandable panel
+                                with st.expander("📜 View Audit Trail", expanded=False):
+                                    audit_total = session.query(func.count(AuditLog.id)).filter(
+                                        AuditLog.alert_id == selected_alert_id
+                                    ).scalar()
+                                    audit_page = 1
+                                    if audit_total > AUDIT_TRAIL_PAGE:
+                                        audit_page = st.number_input(
+                                            f"Page (of {math.ceil(audit_total / AUDIT_TRAIL_PAGE)})",
+                                            min_value=1, max_value=math.ceil(audit_total / AUDIT_TRAIL_PAGE),
+                                            step=1, key=f"audit_page_{selected_alert_id}"
+                                        )
+                                    audit_df = pd.read_sql(
+                                        select(
+                                            AuditLog.timestamp.label('Timestamp'),
+                                            AuditLog.analyst_id.label('Analyst'),
+                                            AuditLog.action.label('Action'),
+                                            AuditLog.details.label('Details')
+                                        ).where(
+                                            AuditLog.alert_id == selected_alert_id
+                                        ).order_by(AuditLog.timestamp.desc()).limit(AUDIT_TRAIL_PAGE).offset(
+                                            (audit_page - 1) * AUDIT_TRAIL_PAGE
+                                        ),
+                                        session.connection()
+                                    )
+                                    
+                                    if not audit_df.empty:
+                                        # Timestamps stay datetime64 and are formatted by the frontend
+                                        audit_df['Details'] = audit_df['Details'].fillna('-').replace('', '-')
+                                        st.dataframe(
+                                            audit_df, use_container_width=True, hide_index=True,
+                                            column_config={
+                                                'Timestamp': st.column_config.DatetimeColumn(format="YYYY-MM-DD HH:mm:ss")
+                                            }
+                                        )
+                                    else:
+                                        st.info("No audit log entries for this alert.")
                 
-                with col2:
-                    if not alert_df.empty:
-                        st.markdown("#### Alerts Over Time")
-                        # Convert to datetime and extract date
-                        alert_df['date'] = pd.to_datetime(alert_df['created_at']).dt.date
+                with analytics_tab:
+                    # Use all alerts for analytics (not just the limited 20 for table)
+                    # This ensures charts show full data, not just the 20 shown in the table
+                    analytics = build_analytics_frames(
+                        status_filter, severity_filter, date_range, merchant_filter, analyst_filter
+                    )
+                    
+                    if analytics.total_alerts:
+                        # Row 1: Severity Pie Chart and Status Chart
+                        col1, col2 = st.columns(2)
                         
-                        # Group by date and count alerts per day
-                        daily_counts = alert_df.groupby('date').size().reset_index(name='Alert Count')
-                        daily_counts.columns = ['Date', 'Alert Count']
+                        with col1:
+                            if analytics.total_alerts:
+                                st.markdown("#### Alerts by Severity")
+                                st.plotly_chart(make_severity_pie(analytics.severity_counts), use_container_width=True)
+                                st.caption("**Distribution by Severity Level**")
                         
-                        # Sort by date to ensure proper time series
-                        daily_counts = daily_counts.sort_values('Date')
+                        with col2:
+                            if analytics.total_alerts:
+                                st.markdown("#### Alerts by Status")
+                                status_counts = analytics.status_counts
+                                status_df = pd.DataFrame({
+                                    'Status': status_counts.index,
+                                    'Count': status_counts.values
+                                })
+                                st.bar_chart(status_df.set_index('Status'))
+                                st.caption("**Distribution by Status**")
                         
-                        # Use plotly for better line chart with area fill
-                        fig_time = go.Figure()
-                        fig_time.add_trace(go.Scatter(
-                            x=daily_counts['Date'],
-                            y=daily_counts['Alert Count'],
-                            mode='lines+markers',
-                            fill='tonexty' if len(daily_counts) > 1 else 'tozeroy',
-                            fillcolor='rgba(30, 58, 138, 0.2)',
-                            line=dict(color='#1e3a8a', width=3),
-                            marker=dict(color='#1e3a8a', size=8)
-                        ))
+                        # Row 2: Top Risky Merchants (Horizontal Bar) and Time Chart
+                        st.divider()
+                        col1, col2 = st.columns(2)
                         
-                        fig_time.update_layout(
-                            xaxis_title="Date",
-                            yaxis_title="Alert Count",
-                            height=300,
-                            font=dict(color='#1e293b', size=11),
-                            margin=dict(l=0, r=0, t=0, b=0),
-                            hovermode='x unified',
-                            xaxis=dict(type='date'),
-                            showlegend=False
-                        )
+                        with col1:
+                            if analytics.top_merchants:
+                                st.markdown("#### Top Risky Merchants")
+                                st.plotly_chart(make_merchant_bar(analytics.top_merchants), use_container_width=True)
+                                st.caption("**Top 10 Merchants by Alert Count**")
+                            else:
+                                st.info("No merchant data available.")
                         
-                        st.plotly_chart(fig_time, use_container_width=True)
-                        st.caption(f"**Daily Alert Trends** ({len(alert_df)} total alerts shown)")
+                        with col2:
+                            if analytics.total_alerts:
+                                st.markdown("#### Alerts Over Time")
+                                st.plotly_chart(make_time_line(analytics.daily_counts), use_container_width=True)
+                                st.caption(f"**Daily Alert Trends** ({analytics.total_alerts} total alerts shown)")
+                            else:
+                                st.info("No alert data available for time series.")
                     else:
-                        st.info("No alert data available for time series.")
-            else:
-                st.info("No alerts available for analytics.")
-            
-            # Mini Audit Log Feed at bottom
-            st.divider()
-            st.subheader("📜 Recent Activity Feed")
-            st.caption("Last 5 system actions across all alerts")
-            
-            # Get last 5 audit log entries
-            recent_logs = session.query(AuditLog).order_by(AuditLog.timestamp.desc()).limit(5).all()
-            
-            if recent_logs:
-                log_feed_data = []
-                for log in recent_logs:
-                    # Get alert details for context
-                    alert = session.query(Alert).filter(Alert.alert_id == log.alert_id).first()
-                    alert_severity = alert.severity if alert else "N/A"
-                    
+                        st.info("No alerts available for analytics.")
+                
+                # Mini Audit Log Feed at bottom
+                st.divider()
+                st.subheader("📜 Recent Activity Feed")
+                st.caption("Last 5 system actions across all alerts")
+                
+                # Get last 5 audit log entries
+                log_df = pd.read_sql(
+                    select(
+                        AuditLog.timestamp,
+                        AuditLog.action,
+                        AuditLog.analyst_id,
+                        AuditLog.alert_id,
+                        Alert.severity,
+                        AuditLog.details
+                    ).outerjoin(
+                        Alert, Alert.alert_id == AuditLog.alert_id
+                    ).order_by(AuditLog.timestamp.desc()).limit(5),
+                    session.connection()
+                )
+                
+                if not log_df.empty:
                     # Format action with icon
                     action_icon = {
                         "VIEWED": "👁️",
@@ -1199,165 +1626,149 @@ def main():
                         "NOTE_ADDED": "📝",
                         "REVIEWING": "🔍",
                         "ASSIGNED": "👤"
-                    }.get(log.action, "⚪")
-                    
-                    log_feed_data.append({
-                        'Time': log.timestamp.strftime('%Y-%m-%d %H:%M:%S'),
-                        'Action': f"{action_icon} {log.action}",
-                        'Analyst': log.analyst_id,
-                        'Alert ID': log.alert_id[:12] + '...' if len(log.alert_id) > 12 else log.alert_id,
-                        'Severity': alert_severity,
-                        'Details': (log.details[:50] + '...') if log.details and len(log.details) > 50 else (log.details or '-')
+                    }
+                    alert_ids = log_df['alert_id']
+                    details = log_df['details'].fillna('')
+                    log_df = pd.DataFrame({
+                        'Time': log_df['timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S'),
+                        'Action': log_df['action'].map(action_icon).fillna("⚪") + ' ' + log_df['action'],
+                        'Analyst': log_df['analyst_id'],
+                        'Alert ID': alert_ids.where(alert_ids.str.len() <= 12, alert_ids.str[:12] + '...'),
+                        'Severity': log_df['severity'].fillna("N/A"),
+                        'Details': details.where(details.str.len() <= 50, details.str[:50] + '...').replace('', '-')
                     })
-                
-                log_df = pd.DataFrame(log_feed_data)
-                
-                # Color code by action type
-                def color_action(val):
-                    if 'RESOLVED' in str(val) or '✅' in str(val):
-                        return 'background-color: #d1fae5; color: #065f46'
-                    elif 'ESCALATED' in str(val) or '🚨' in str(val):
-                        return 'background-color: #fee2e2; color: #991b1b'
-                    elif 'DISMISSED' in str(val) or '❌' in str(val):
-                        return 'background-color: #e5e7eb; color: #374151'
-                    elif 'VIEWED' in str(val) or '👁️' in str(val):
-                        return 'background-color: #eff6ff; color: #1e40af'
-                    return ''
-                
-                try:
-                    styled_log_df = log_df.style.map(color_action, subset=['Action'])
-                except AttributeError:
-                    styled_log_df = log_df.style.applymap(color_action, subset=['Action'])
-                
-                st.dataframe(styled_log_df, use_container_width=True, hide_index=True, height=200)
-            else:
-                st.info("No recent activity to display.")
-        
-        elif view_mode == "Customer Profile":
-            st.divider()
-            st.subheader("👤 Customer Risk Profile & Investigation")
-            
-            # Get customer ID input
-            customer_id_input = st.text_input(
-                "**Enter Customer ID:**",
-                value=st.session_state.get('customer_id_to_view', ''),
-                key="customer_id_input",
-                placeholder="e.g., CUST12345678"
-            )
-            
-            if customer_id_input:
-                try:
-                    profile = get_customer_risk_profile(customer_id_input, session)
-                    
-                    # Summary metrics
-                    st.markdown("#### 📊 Risk Overview")
-                    col1, col2, col3, col4 = st.columns(4)
-                    
-                    with col1:
-                        st.metric("Total Alerts", profile['total_alerts'])
-                    with col2:
-                        st.metric("Avg Risk Score", f"{profile['avg_risk_score']:.1f}")
-                    with col3:
-                        st.metric("Max Risk Score", f"{profile['max_risk_score']:.1f}")
-                    with col4:
-                        st.metric("Total Transactions", profile['total_transactions'])
-                    
-                    st.markdown("<br>", unsafe_allow_html=True)
-                    
-                    # Alert breakdown
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.markdown("#### 📈 Alerts by Severity")
-                        severity_df = pd.DataFrame({
-                            'Severity': list(profile['severity_counts'].keys()),
-                            'Count': list(profile['severity_counts'].values())
-                        })
-                        st.bar_chart(severity_df.set_index('Severity'))
-                    
-                    with col2:
-                        st.markdown("#### 📊 Alerts by Status")
-                        status_df = pd.DataFrame({
-                            'Status': list(profile['status_counts'].keys()),
-                            'Count': list(profile['status_counts'].values())
-                        })
-                        st.bar_chart(status_df.set_index('Status'))
-                    
-                    st.markdown("<br>", unsafe_allow_html=True)
                     
-                    # Transaction statistics
-                    st.markdown("#### 💰 Transaction Statistics")
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        st.metric("Total Amount", f"${profile['total_amount']:,.2f}")
-                    with col2:
-                        st.metric("Avg Transaction", f"${profile['avg_amount']:,.2f}")
-                    with col3:
-                        st.metric("Max Transaction", f"${profile['max_amount']:,.2f}")
-                    
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.metric("Recent Activity (7 days)", f"{profile['recent_count']} transactions")
-                    with col2:
-                        st.metric("Recent Amount (7 days)", f"${profile['recent_amount']:,.2f}")
-                    
-                    st.markdown("<br>", unsafe_allow_html=True)
-                    
-                    # Pattern indicators
-                    st.markdown("#### 🔍 Pattern Indicators")
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.metric("Unique Locations", profile['unique_locations'])
-                    with col2:
-                        st.metric("Unique Devices", profile['unique_devices'])
+                    # Color code by action type
+                    def color_action(val):
+                        if 'RESOLVED' in str(val) or '✅' in str(val):
+                            return 'background-color: #d1fae5; color: #065f46'
+                        elif 'ESCALATED' in str(val) or '🚨' in str(val):
+                            return 'background-color: #fee2e2; color: #991b1b'
+                        elif 'DISMISSED' in str(val) or '❌' in str(val):
+                            return 'background-color: #e5e7eb; color: #374151'
+                        elif 'VIEWED' in str(val) or '👁️' in str(val):
+                            return 'background-color: #eff6ff; color: #1e40af'
+                        return ''
                     
-                    st.markdown("<br>", unsafe_allow_html=True)
+                    try:
+                        styled_log_df = log_df.style.map(color_action, subset=['Action'])
+                    except AttributeError:
+                        styled_log_df = log_df.style.applymap(color_action, subset=['Action'])
                     
-                    # Recent alerts
-                    if profile['alerts']:
-                        st.markdown(f"#### 🚨 Recent Alerts (showing {len(profile['alerts'])} of {profile['total_alerts']})")
-                        alert_data = []
-                        for alert in profile['alerts']:
-                            alert_data.append({
-                                'Alert ID': alert.alert_id,
-                                'Severity': alert.severity,
-                                'Risk Score': f"{alert.risk_score:.1f}",
-                                'Status': alert.status,
-                                'Created': alert.created_at.strftime('%Y-%m-%d %H:%M:%S')
+                    st.dataframe(styled_log_df, use_container_width=True, hide_index=True, height=200)
+                else:
+                    st.info("No recent activity to display.")
+            
+            elif view_mode == "Customer Profile":
+                st.divider()
+                st.subheader("👤 Customer Risk Profile & Investigation")
+                
+                # Get customer ID input
+                customer_id_input = st.text_input(
+                    "**Enter Customer ID:**",
+                    value=st.session_state.get('customer_id_to_view', ''),
+                    key="customer_id_input",
+                    placeholder="e.g., CUST12345678"
+                )
+                
+                if st.button("🔄 Refresh Profile", key="refresh_profile"):
+                    load_customer_profile.clear()
+                
+                if customer_id_input:
+                    try:
+                        # Start from the first page whenever a different customer is viewed
+                        if st.session_state.get('profile_pages_customer') != customer_id_input:
+                            st.session_state.profile_pages_customer = customer_id_input
+                            st.session_state.profile_pages = 1
+                        profile = load_customer_profile(customer_id_input, st.session_state.profile_pages)
+                        
+                        # Summary metrics
+                        st.markdown("#### 📊 Risk Overview")
+                        col1, col2, col3, col4 = st.columns(4)
+                        
+                        with col1:
+                            st.metric("Total Alerts", profile['total_alerts'])
+                        with col2:
+                            st.metric("Avg Risk Score", f"{profile['avg_risk_score']:.1f}")
+                        with col3:
+                            st.metric("Max Risk Score", f"{profile['max_risk_score']:.1f}")
+                        with col4:
+                            st.metric("Total Transactions", profile['total_transactions'])
+                        
+                        st.markdown(SPACER_HTML, unsafe_allow_html=True)
+                        
+                        # Alert breakdown
+                        col1, col2 = st.columns(2)
+                        
+                        with col1:
+                            st.markdown("#### 📈 Alerts by Severity")
+                            severity_df = pd.DataFrame({
+                                'Severity': list(profile['severity_counts'].keys()),
+                                'Count': list(profile['severity_counts'].values())
                             })
-                        st.dataframe(pd.DataFrame(alert_data), use_container_width=True, hide_index=True)
-                    
-                    st.markdown("<br>", unsafe_allow_html=True)
-                    
-                    # Recent transactions
-                    if profile['transactions']:
-                        st.markdown(f"#### 💳 Recent Transactions (showing {len(profile['transactions'])} of {profile['total_transactions']})")
-                        txn_data = []
-                        for txn in profile['transactions']:
-                            txn_data.append({
-                                'Transaction ID': txn.transaction_id,
-                                'Merchant': txn.merchant,
-                                'Amount': f"${txn.amount:,.2f}",
-                                'Date': txn.transaction_date.strftime('%Y-%m-%d %H:%M:%S'),
-                                'Location': f"{txn.city}, {txn.country}",
-                                'Device': txn.device_id
+                            st.bar_chart(severity_df.set_index('Severity'))
+                        
+                        with col2:
+                            st.markdown("#### 📊 Alerts by Status")
+                            status_df = pd.DataFrame({
+                                'Status': list(profile['status_counts'].keys()),
+                                'Count': list(profile['status_counts'].values())
                             })
-                        st.dataframe(pd.DataFrame(txn_data), use_container_width=True, hide_index=True)
-                
-                except Exception as e:
-                    st.error(f"❌ Error loading customer profile: {e}")
-                    st.info("ℹ️ Customer not found. Please check the Customer ID and try again.")
-    
-    except Exception as e:
-        st.error(f"❌ Error loading data: {e}")
-        import traceback
-        st.code(traceback.format_exc())
-    finally:
-        session.close()
+                            st.bar_chart(status_df.set_index('Status'))
+                        
+                        # Transaction statistics (spacer and heading in one element)
+                        st.markdown(f"{SPACER_HTML}\n\n#### 💰 Transaction Statistics", unsafe_allow_html=True)
+                        col1, col2, col3 = st.columns(3)
+                        with col1:
+                            st.metric("Total Amount", f"${profile['total_amount']:,.2f}")
+                        with col2:
+                            st.metric("Avg Transaction", f"${profile['avg_amount']:,.2f}")
+                        with col3:
+                            st.metric("Max Transaction", f"${profile['max_amount']:,.2f}")
+                        
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            st.metric("Recent Activity (7 days)", f"{profile['recent_count']} transactions")
+                        with col2:
+                            st.metric("Recent Amount (7 days)", f"${profile['recent_amount']:,.2f}")
+                        
+                        # Pattern indicators
+                        st.markdown(f"{SPACER_HTML}\n\n#### 🔍 Pattern Indicators", unsafe_allow_html=True)
+                        st.markdown(
+                            '<div style="display:flex;gap:2rem">'
+                            '<div><div class="metric-label">Unique Locations</div>'
+                            f'<div class="metric-value">{profile["unique_locations"]}</div></div>'
+                            '<div><div class="metric-label">Unique Devices</div>'
+                            f'<div class="metric-value">{profile["unique_devices"]}</div></div>'
+                            '</div>',
+                            unsafe_allow_html=True
+                        )
+                        
+                        # Recent alerts and transactions
+                        if profile['alerts']:
+                            render_profile_alerts_panel(profile['alerts'], profile['total_alerts'])
+                        if profile['transactions']:
+                            render_profile_transactions_panel(profile['transactions'], profile['total_transactions'])
+                        
+                        has_more_rows = (
+                            len(profile['alerts']) < min(profile['total_alerts'], PROFILE_MAX_ROWS) or
+                            len(profile['transactions']) < min(profile['total_transactions'], PROFILE_MAX_ROWS)
+                        )
+                        if has_more_rows and st.button("⬇️ Load more", key="profile_load_more"):
+                            st.session_state.profile_pages += 1
+                            st.rerun()
+                    
+                    except Exception as e:
+                        st.error(f"❌ Error loading customer profile: {e}")
+                        st.info("ℹ️ Customer not found. Please check the Customer ID and try again.")
+        
+        except Exception as e:
+            st.error(f"❌ Error loading data: {e}")
+            st.code(traceback.format_exc())
     
     # Footer with branding
     st.markdown("<hr>", unsafe_allow_html=True)
-    st.caption("Fraud Alert Management Simulator | Portfolio Prototype by Kunaal | 2025")
+    st.caption(FOOTER_CAPTION)
 
 
 if __name__ == '__main__':
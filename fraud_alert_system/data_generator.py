@@ -1,226 +1,303 @@
 """Generate synthetic transaction data for testing."""
 import pandas as pd
-import random
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from datetime import datetime, timedelta
+from collections import defaultdict, deque
 import string
 import os
+from concurrent.futures import ProcessPoolExecutor
 
 
-def generate_transaction_id():
-    """Generate a unique transaction ID."""
-    return 'TXN' + ''.join(random.choices(string.ascii_uppercase + string.digits, k=12))
+# Character set for transaction and device IDs
+ID_CHARS = string.ascii_uppercase + string.digits
 
 
-def generate_customer_id():
-    """Generate a customer ID."""
-    return 'CUST' + ''.join(random.choices(string.digits, k=8))
-
-
-def generate_device_id():
-    """Generate a device ID."""
-    return 'DEV' + ''.join(random.choices(string.ascii_uppercase + string.digits, k=10))
-
-
-def generate_ip_address():
-    """Generate a random IP address."""
-    return f"{random.randint(1, 255)}.{random.randint(1, 255)}.{random.randint(1, 255)}.{random.randint(1, 255)}"
-
-
-# Merchant data
-MERCHANTS = [
+# Merchant data (tuples: the lookup tables are fixed)
+MERCHANTS = (
     "Amazon", "Walmart", "Target", "Best Buy", "Home Depot", "Costco",
     "Starbucks", "McDonald's", "Shell", "Chevron", "Uber", "Lyft",
     "Apple Store", "Microsoft Store", "Netflix", "Spotify", "Airbnb",
     "Booking.com", "Expedia", "Delta Airlines", "United Airlines",
     "Nike", "Adidas", "Zara", "H&M", "Whole Foods", "Trader Joe's"
-]
+)
 
-CITIES = [
+CITIES = (
     ("New York", "USA"), ("Los Angeles", "USA"), ("Chicago", "USA"),
     ("Houston", "USA"), ("Miami", "USA"), ("San Francisco", "USA"),
     ("Toronto", "Canada"), ("London", "UK"), ("Paris", "France"),
     ("Berlin", "Germany"), ("Tokyo", "Japan"), ("Sydney", "Australia"),
     ("Dubai", "UAE"), ("Singapore", "Singapore"), ("Hong Kong", "China")
-]
+)
+
+CARD_TYPES = ("Visa", "Mastercard", "Amex", "Discover")
 
-MCC_CODES = ["5411", "5812", "5814", "5912", "5999", "5311", "5331", "5399"]
+MCC_CODES = ("5411", "5812", "5814", "5912", "5999", "5311", "5331", "5399")
 # High-risk MCC codes for suspicious merchant rule
-HIGH_RISK_MCC_CODES = ["7995", "7273", "5967", "5912"]
+HIGH_RISK_MCC_CODES = ("7995", "7273", "5967", "5912")
+
+# NumPy copies of the lookup tables, indexed in bulk by generate_transactions
+MERCHANT_ARR = np.array(MERCHANTS)
+CARD_TYPE_ARR = np.array(CARD_TYPES)
+MCC_ARR = np.array(MCC_CODES)
+HIGH_RISK_MCC_ARR = np.array(HIGH_RISK_MCC_CODES)
+
+
+def _random_codes(rng, alphabet, length, size):
+    """Draw `size` random codes of `length` characters from `alphabet` in one NumPy pass."""
+    chars = np.array(list(alphabet))
+    return chars[rng.integers(len(chars), size=(size, length))].view(f'<U{length}').ravel()
 
 
-def generate_transactions(num_transactions=500, days_back=30):
-    """Generate synthetic transaction data."""
-    transactions = []
-    customer_pools = {generate_customer_id(): {
-        'device_id': generate_device_id(),
-        'last_location': random.choice(CITIES),
+def generate_transactions(num_transactions=500, days_back=30, seed=None, workers=1, end_date=None):
+    """
+    Generate synthetic transaction data over the days_back days before
+    end_date (default: now).
+    With workers > 1 the customer pool is split into that many shards, each
+    generated in its own process; a customer's velocity and location state
+    stays within its shard. Passing a seed and an end_date makes the output
+    reproducible; with only a seed, the dates still move with the clock.
+    """
+    rng = np.random.default_rng(seed)
+    # Customer pool, with IDs, devices and home cities drawn in bulk
+    pool_size = 100
+    customer_pools = {customer_id: {
+        'device_id': device_id,
+        'last_location': CITIES[city],
         'last_transaction_time': None,
         'transaction_count': 0
-    } for _ in range(100)}
+    } for customer_id, device_id, city in zip(
+        np.char.add('CUST', _random_codes(rng, string.digits, 8, pool_size)).tolist(),
+        np.char.add('DEV', _random_codes(rng, ID_CHARS, 10, pool_size)).tolist(),
+        rng.integers(len(CITIES), size=pool_size).tolist()
+    )}
     
-    start_date = datetime.now() - timedelta(days=days_back)
+    start_date = (end_date or datetime.now()) - timedelta(days=days_back)
     
-    # Track transactions per customer for velocity detection
-    customer_transaction_times = {}
+    if workers <= 1:
+        return _generate_shard(rng, num_transactions, days_back, start_date, customer_pools)
+    
+    # Shard the customers, and the transactions in proportion to them
+    customer_shards = np.array_split(np.array(list(customer_pools)), workers)
+    shard_sizes = np.diff(np.round(
+        np.cumsum([0] + [len(shard) for shard in customer_shards]) * num_transactions / pool_size
+    ).astype(int))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        frames = list(executor.map(
+            _generate_shard,
+            rng.spawn(workers),
+            shard_sizes.tolist(),
+            [days_back] * workers,
+            [start_date] * workers,
+            [{customer_id: customer_pools[customer_id] for customer_id in shard.tolist()}
+             for shard in customer_shards]
+        ))
+    return pd.concat(frames, ignore_index=True)
+
+
+def _generate_shard(rng, n, days_back, start_date, customer_pools):
+    """Generate n transactions for the customers in customer_pools, drawing from rng."""
+    customer_ids = list(customer_pools.keys())
+    
+    # Track each customer's last 10 transaction times for velocity detection
+    customer_transaction_times = defaultdict(lambda: deque(maxlen=10))
     
     # Create some high-risk customers with multiple patterns
-    high_risk_customers = list(customer_pools.keys())[:20]  # First 20 customers as high-risk
-    
-    for i in range(num_transactions):
-        # Create intentional fraud patterns for variety of severities
-        # 10% - CRITICAL scenarios (multiple high-risk patterns)
-        # 15% - HIGH scenarios (2-3 risk patterns)
-        # 25% - MEDIUM scenarios (2 moderate patterns)
-        # 50% - LOW scenarios (normal transactions, maybe 1 pattern)
-        
-        fraud_scenario = random.random()
-        
-        # Select a customer (some customers will have multiple transactions)
-        customer_id = random.choice(list(customer_pools.keys()))
+    high_risk_customers = set(customer_ids[:20])  # First 20 customers as high-risk
+    
+    # Create intentional fraud patterns for variety of severities
+    # 10% - CRITICAL scenarios (multiple high-risk patterns)
+    # 15% - HIGH scenarios (2-3 risk patterns)
+    # 25% - MEDIUM scenarios (2 moderate patterns)
+    # 50% - LOW scenarios (normal transactions, maybe 1 pattern)
+    fraud_scenario = rng.random(n)
+    critical = fraud_scenario < 0.10
+    high = ~critical & (fraud_scenario < 0.25)
+    medium = (fraud_scenario >= 0.25) & (fraud_scenario < 0.50)
+    low = fraud_scenario >= 0.50
+    
+    # Every random draw that does not depend on earlier transactions is
+    # taken up front, column-wise; only dates and locations stay in the loop
+    variant = rng.random(n)  # HIGH: velocity vs geo jump; MEDIUM: which rule pair
+    medium_unusual_time = medium & (variant < 0.33)
+    medium_velocity_geo = medium & (variant >= 0.33) & (variant < 0.66)
+    medium_suspicious = medium & (variant >= 0.66)
+    low_amount_roll = rng.random(n)
+    low_amount_roll2 = rng.random(n)
+    low_new_device = low & (rng.random(n) >= 0.85)
+    low_moves = low & (rng.random(n) >= 0.75)
+    
+    # Amount ranges: high amounts for CRITICAL/HIGH and the high-amount MEDIUM pairs;
+    # LOW is mostly small with an occasional high amount (single rule)
+    amount_ranges = [critical, high, medium_unusual_time | medium_suspicious, medium_velocity_geo,
+                     low_amount_roll < 0.15, low_amount_roll2 < 0.3]
+    amounts = np.round(rng.uniform(
+        np.select(amount_ranges, [6000, 5500, 5500, 1000, 5000, 1000], default=10),
+        np.select(amount_ranges, [12000, 10000, 8000, 4500, 15000, 5000], default=1000)
+    ), 2)
+    
+    # Minutes after the customer's last transaction (velocity patterns)
+    velocity_minutes = rng.integers(
+        np.select([critical, high], [5, 10], default=15),
+        np.select([critical, high], [30, 45], default=45) + 1
+    )
+    # Hour of day: 2-4 AM for unusual-time patterns, otherwise a business-hours or any-hour range
+    unusual_hour = critical | (high & (variant >= 0.5)) | medium_unusual_time
+    hours = rng.integers(
+        np.select([unusual_hour, low], [2, 0], default=10),
+        np.select([unusual_hour, low, medium_suspicious], [4, 23, 22], default=20) + 1
+    )
+    
+    # Regular MCC codes, with high-risk ones drawn only for the rows that need them
+    mcc_codes = MCC_ARR[rng.integers(len(MCC_ARR), size=n)]
+    suspicious = critical | medium_suspicious
+    mcc_codes[suspicious] = HIGH_RISK_MCC_ARR[rng.integers(len(HIGH_RISK_MCC_ARR), size=suspicious.sum())]
+    # Select a customer per row (some customers will have multiple transactions)
+    row_customer_ids = np.asarray(customer_ids)[rng.integers(len(customer_ids), size=n)]
+    city_idx = rng.integers(len(CITIES), size=n)
+    new_device_ids = np.char.add('DEV', _random_codes(rng, ID_CHARS, 10, n))
+    
+    # Generate transaction dates (more recent transactions are more common)
+    # sampled in one pass by inverting the cumulative day weights
+    day_cdf = np.cumsum(1.5 ** (days_back - np.arange(days_back)))
+    day_cdf /= day_cdf[-1]
+    days_ago = np.searchsorted(day_cdf, rng.random(n), side='right').tolist()
+    # Start of each day in the range, built once rather than per row
+    day_starts = [start_date + timedelta(days=day) for day in range(days_back)]
+    
+    # The loop reads these one row at a time; indexing Python lists is much
+    # cheaper than indexing NumPy arrays element by element
+    customer_rows = row_customer_ids.tolist()
+    hours, velocity_minutes, city_idx, variant = (
+        hours.tolist(), velocity_minutes.tolist(), city_idx.tolist(), variant.tolist()
+    )
+    critical, high, medium, medium_velocity_geo, low_moves, low_new_device = (
+        critical.tolist(), high.tolist(), medium.tolist(),
+        medium_velocity_geo.tolist(), low_moves.tolist(), low_new_device.tolist()
+    )
+    new_device_ids = new_device_ids.tolist()
+    
+    transaction_dates = []
+    device_ids = []
+    cities = []
+    countries = []
+    
+    for i in range(n):
+        # The customer drawn for this row
+        customer_id = customer_rows[i]
         customer = customer_pools[customer_id]
         is_high_risk_customer = customer_id in high_risk_customers
         
-        # Generate transaction date (more recent transactions are more common)
-        days_ago = random.choices(
-            range(days_back),
-            weights=[1.5 ** (days_back - d) for d in range(days_back)]
-        )[0]
+        base_time = day_starts[days_ago[i]]
+        hour = hours[i]
         
         # Track velocity for high-risk customers
-        if customer_id not in customer_transaction_times:
-            customer_transaction_times[customer_id] = []
+        previous_times = customer_transaction_times[customer_id]
         
         # CRITICAL scenario: High amount + Velocity + Geo jump + Unusual time
-        if fraud_scenario < 0.10:
-            amount = random.uniform(6000, 12000)  # High amount
+        if critical[i]:
             # Create rapid transactions for velocity
-            if len(customer_transaction_times[customer_id]) > 0:
-                last_txn_time = max(customer_transaction_times[customer_id])
-                transaction_date = last_txn_time + timedelta(minutes=random.randint(5, 30))
+            if previous_times:
+                transaction_date = max(previous_times) + timedelta(minutes=velocity_minutes[i])
             else:
-                base_time = start_date + timedelta(days=days_ago)
-                transaction_date = base_time.replace(hour=random.randint(2, 4))  # Unusual time (2-5 AM)
-            
-            city, country = random.choice(CITIES)  # Geo jump
-            customer['last_location'] = (city, country)
-            device_id = customer['device_id']
-            mcc_code = random.choice(HIGH_RISK_MCC_CODES)  # Suspicious merchant
+                transaction_date = base_time.replace(hour=hour)  # Unusual time (2-5 AM)
+            customer['last_location'] = CITIES[city_idx[i]]  # Geo jump
         
         # HIGH scenario: High amount + Velocity OR High amount + Geo jump + Unusual time
-        elif fraud_scenario < 0.25:
-            amount = random.uniform(5500, 10000)  # High amount
-            if random.random() < 0.5:
+        elif high[i]:
+            if variant[i] < 0.5:
                 # Velocity pattern
-                if len(customer_transaction_times[customer_id]) > 0:
-                    last_txn_time = max(customer_transaction_times[customer_id])
-                    transaction_date = last_txn_time + timedelta(minutes=random.randint(10, 45))
+                if previous_times:
+                    transaction_date = max(previous_times) + timedelta(minutes=velocity_minutes[i])
                 else:
-                    transaction_date = start_date + timedelta(days=days_ago, hours=random.randint(10, 20))
-                city, country = customer['last_location']
+                    transaction_date = base_time + timedelta(hours=hour)
             else:
                 # Geo jump + Unusual time
-                transaction_date = start_date + timedelta(days=days_ago)
-                transaction_date = transaction_date.replace(hour=random.randint(2, 4))  # Unusual time
-                city, country = random.choice(CITIES)  # Geo jump
-                customer['last_location'] = (city, country)
-            device_id = customer['device_id']
-            mcc_code = random.choice(MCC_CODES)
+                transaction_date = base_time.replace(hour=hour)
+                customer['last_location'] = CITIES[city_idx[i]]
         
         # MEDIUM scenario: Need 2 rules to reach 40+ points
         # Options: High amount + Unusual time (40), Velocity + Geo jump (45), High amount + Suspicious merchant (45)
-        elif fraud_scenario < 0.50:
-            base_time = start_date + timedelta(days=days_ago)
-            scenario_type = random.random()
-            
-            if scenario_type < 0.33:
-                # High amount + Unusual time = 30 + 10 = 40 (MEDIUM)
-                amount = random.uniform(5500, 8000)  # High amount
-                transaction_date = base_time.replace(hour=random.randint(2, 4))  # Unusual time
-                city, country = customer['last_location']
-                mcc_code = random.choice(MCC_CODES)
-            elif scenario_type < 0.66:
+        elif medium[i]:
+            if medium_velocity_geo[i]:
                 # Velocity + Geo jump = 25 + 20 = 45 (MEDIUM)
-                amount = random.uniform(1000, 4500)  # Not high amount
-                if len(customer_transaction_times[customer_id]) > 0:
-                    last_txn_time = max(customer_transaction_times[customer_id])
-                    transaction_date = last_txn_time + timedelta(minutes=random.randint(15, 45))
+                if previous_times:
+                    transaction_date = max(previous_times) + timedelta(minutes=velocity_minutes[i])
                 else:
-                    transaction_date = base_time.replace(hour=random.randint(10, 20))
-                city, country = random.choice(CITIES)  # Geo jump
-                customer['last_location'] = (city, country)
-                mcc_code = random.choice(MCC_CODES)
+                    transaction_date = base_time.replace(hour=hour)
+                customer['last_location'] = CITIES[city_idx[i]]  # Geo jump
             else:
+                # High amount + Unusual time = 30 + 10 = 40, or
                 # High amount + Suspicious merchant = 30 + 15 = 45 (MEDIUM)
-                amount = random.uniform(5500, 8000)  # High amount
-                transaction_date = base_time.replace(hour=random.randint(10, 22))
-                city, country = customer['last_location']
-                mcc_code = random.choice(HIGH_RISK_MCC_CODES)  # Suspicious merchant
-            
-            device_id = customer['device_id']
+                transaction_date = base_time.replace(hour=hour)
         
         # LOW scenario: Normal transaction patterns
         else:
-            if random.random() < 0.85:
-                device_id = customer['device_id']
-            else:
-                device_id = generate_device_id()
-            
-            if random.random() < 0.75:
-                city, country = customer['last_location']
-            else:
-                city, country = random.choice(CITIES)
-                customer['last_location'] = (city, country)
-            
-            if random.random() < 0.15:
-                amount = random.uniform(5000, 15000)  # High amount (single rule)
-            elif random.random() < 0.3:
-                amount = random.uniform(1000, 5000)
-            else:
-                amount = random.uniform(10, 1000)
-            
-            transaction_date = start_date + timedelta(days=days_ago, hours=random.randint(0, 23))
-            mcc_code = random.choice(MCC_CODES)
+            if low_moves[i]:
+                customer['last_location'] = CITIES[city_idx[i]]
+            transaction_date = base_time + timedelta(hours=hour)
+        
+        city, country = customer['last_location']
         
         # Velocity tracking
-        customer_transaction_times[customer_id].append(transaction_date)
-        if len(customer_transaction_times[customer_id]) > 10:
-            customer_transaction_times[customer_id] = customer_transaction_times[customer_id][-10:]
+        previous_times.append(transaction_date)
         
         customer['transaction_count'] += 1
         customer['last_transaction_time'] = transaction_date
         
-        transaction = {
-            'transaction_id': generate_transaction_id(),
-            'customer_id': customer_id,
-            'merchant': random.choice(MERCHANTS),
-            'amount': round(amount, 2),
-            'currency': 'USD',
-            'transaction_date': transaction_date,
-            'card_type': random.choice(['Visa', 'Mastercard', 'Amex', 'Discover']),
-            'device_id': device_id,
-            'ip_address': generate_ip_address(),
-            'country': country,
-            'city': city,
-            'mcc_code': mcc_code,
-            'status': 'completed'
-        }
-        
-        transactions.append(transaction)
+        transaction_dates.append(transaction_date)
+        device_ids.append(new_device_ids[i] if low_new_device[i] else customer['device_id'])
+        cities.append(city)
+        countries.append(country)
+    
+    octets = rng.integers(1, 256, size=(n, 4)).astype('U3')
+    ip_addresses = octets[:, 0]
+    for k in range(1, 4):
+        ip_addresses = np.char.add(np.char.add(ip_addresses, '.'), octets[:, k])
     
-    return pd.DataFrame(transactions)
+    return pd.DataFrame({
+        'transaction_id': np.char.add('TXN', _random_codes(rng, ID_CHARS, 12, n)),
+        'customer_id': row_customer_ids,
+        'merchant': MERCHANT_ARR[rng.integers(len(MERCHANT_ARR), size=n)],
+        'amount': amounts,
+        'currency': 'USD',
+        'transaction_date': transaction_dates,
+        'card_type': CARD_TYPE_ARR[rng.integers(len(CARD_TYPE_ARR), size=n)],
+        'device_id': device_ids,
+        'ip_address': ip_addresses,
+        'country': countries,
+        'city': cities,
+        'mcc_code': mcc_codes,
+        'status': 'completed'
+    })
 
 
-def save_transactions_to_csv(df, filepath='data/transactions.csv'):
-    """Save transactions to CSV file."""
+def save_transactions(df, filepath='data/transactions.parquet', format='parquet'):
+    """
+    Save transactions to a Parquet (default) or CSV file.
+    Parquet keeps the column types and is much smaller and faster to reload.
+    """
     os.makedirs(os.path.dirname(filepath), exist_ok=True)
-    df.to_csv(filepath, index=False)
+    if format == 'parquet':
+        df.to_parquet(filepath, engine='pyarrow', compression='zstd', index=False)
+    elif format == 'csv':
+        # Arrow's C++ writer is many times faster than DataFrame.to_csv on large frames
+        pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), filepath)
+    else:
+        raise ValueError(f"Unsupported format: {format}")
     print(f"Saved {len(df)} transactions to {filepath}")
     return filepath
 
 
+def save_transactions_to_csv(df, filepath='data/transactions.csv'):
+    """Save transactions to CSV file."""
+    return save_transactions(df, filepath, format='csv')
+
+
 if __name__ == '__main__':
     # Generate and save sample data
     print("Generating synthetic transaction data...")
     df = generate_transactions(num_transactions=500, days_back=30)
-    save_transactions_to_csv(df)
+    save_transactions(df)
 
@@ -1,5 +1,5 @@
 """Database schema and connection management."""
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey
+from sqlalchemy import create_engine, event, Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from datetime import datetime
@@ -27,6 +27,14 @@ class Transaction(Base):
     mcc_code = Column(String(10))  # Merchant Category Code
     status = Column(String(20), default='completed')
     created_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        # Rule history of small batches (detect_temporal_rules): their customers'
+        # transactions over the velocity / geo jump windows
+        Index('ix_txn_cust_date', 'customer_id', 'transaction_date'),
+        # ...and their devices' transactions over the device sharing window
+        Index('ix_txn_dev_date', 'device_id', 'transaction_date'),
+    )
 
 
 class Alert(Base):
@@ -46,6 +54,13 @@ class Alert(Base):
     resolved_at = Column(DateTime)
     
     transaction = relationship("Transaction")
+    
+    __table_args__ = (
+        # Alert queue filter: status IN, severity IN, created_at range
+        Index('ix_alert_triage', 'status', 'severity', 'created_at'),
+        # Join to transactions
+        Index('ix_alert_txn', 'transaction_id'),
+    )
 
 
 class AuditLog(Base):
@@ -61,6 +76,27 @@ class AuditLog(Base):
     timestamp = Column(DateTime, default=datetime.utcnow, index=True)
     
     alert = relationship("Alert")
+    
+    __table_args__ = (
+        # Audit trail of one alert, newest first
+        Index('ix_audit_alert_ts', 'alert_id', 'timestamp'),
+    )
+
+
+class AlertNote(Base):
+    """Analyst investigation note on an alert; one row per note, appended."""
+    __tablename__ = 'alert_notes'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    alert_id = Column(String(50), ForeignKey('alerts.alert_id'), nullable=False)
+    analyst_id = Column(String(50), nullable=False)
+    note_text = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        # Notes of one alert, oldest first
+        Index('ix_note_alert_ts', 'alert_id', 'created_at'),
+    )
 
 
 def get_database_path():
@@ -70,18 +106,56 @@ def get_database_path():
     return os.path.join(db_dir, 'fraudops.db')
 
 
+# Settings applied to every SQLite connection: WAL lets readers run alongside
+# the writer and commits skip the main-file fsync; a 64 MB page cache, 256 MB
+# of memory-mapped I/O and in-memory temp tables keep the rule scans off disk
+SQLITE_PRAGMAS = (
+    'journal_mode=WAL',
+    'synchronous=NORMAL',
+    'cache_size=-65536',
+    'mmap_size=268435456',
+    'temp_store=MEMORY',
+)
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """Connect hook that applies SQLITE_PRAGMAS to a new connection."""
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(f'PRAGMA {pragma}')
+    cursor.close()
+
+
 def create_database():
     """Create database and tables."""
-    db_path = get_database_path()
-    engine = create_engine(f'sqlite:///{db_path}', echo=False)
+    engine = get_engine()
     Base.metadata.create_all(engine)
+    # create_all skips existing tables, so add indexes introduced since they were created
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
     return engine
 
 
+_ENGINE = None
+
+
+def get_engine():
+    """Get the shared database engine; its connections are tuned with SQLITE_PRAGMAS.
+
+    The engine is created on first use and reused afterwards, so callers share
+    one connection pool instead of opening a new pool per session.
+    """
+    global _ENGINE
+    if _ENGINE is None:
+        db_path = get_database_path()
+        _ENGINE = create_engine(f'sqlite:///{db_path}', echo=False)
+        event.listen(_ENGINE, 'connect', _apply_sqlite_pragmas)
+    return _ENGINE
+
+
 def get_session():
     """Get database session."""
-    db_path = get_database_path()
-    engine = create_engine(f'sqlite:///{db_path}', echo=False)
-    Session = sessionmaker(bind=engine)
+    Session = sessionmaker(bind=get_engine())
     return Session()
 
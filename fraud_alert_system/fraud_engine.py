@@ -1,234 +1,430 @@
 """Rule-based fraud detection engine."""
 from fraud_alert_system.database import get_session, Transaction, Alert
-from datetime import datetime, timedelta
-from sqlalchemy import func, and_, or_
-import uuid
-import yaml
+from fraud_alert_system.config import get_config
+from datetime import timedelta
+from bisect import bisect_right
+from sqlalchemy import and_, exists, insert, or_, select
+import numpy as np
+import pandas as pd
 import os
 
 
-def load_config():
-    """Load configuration from config.yaml file."""
-    config_path = os.path.join(os.path.dirname(__file__), '..', 'config.yaml')
-    if not os.path.exists(config_path):
-        # Return default config if file doesn't exist
-        return {
-            'rules': {
-                'high_amount': {'threshold': 5000, 'enabled': True},
-                'velocity': {'threshold': 5, 'time_window_hours': 1, 'enabled': True},
-                'geo_jump': {'time_window_hours': 2, 'enabled': True},
-                'device_sharing': {'threshold': 3, 'time_window_days': 7, 'enabled': True},
-                'unusual_time': {'start_hour': 2, 'end_hour': 5, 'enabled': True},
-                'suspicious_merchant': {'high_risk_mcc_codes': ['7995', '7273', '5967', '5912'], 'enabled': True}
-            },
-            'rule_weights': {
-                'HIGH_AMOUNT': 30,
-                'VELOCITY': 25,
-                'GEO_JUMP': 20,
-                'DEVICE_SHARING': 15,
-                'UNUSUAL_TIME': 10,
-                'SUSPICIOUS_MERCHANT': 15,
-                'DEFAULT': 5
-            },
-            'severity_thresholds': {
-                'CRITICAL': 80,
-                'HIGH': 60,
-                'MEDIUM': 40,
-                'LOW': 0
-            }
-        }
+def _window_bounds(groups, timestamps, window):
+    """
+    Find each row's window of same-group rows over [timestamp - window, timestamp].
+    
+    Rows are sorted by (group, timestamp) into `order`. For every row (in the
+    original order) positions start <= before <= through into `order` bound its
+    window: order[start:before] are strictly earlier, order[start:through] also
+    include rows at the same timestamp (the row itself among them).
+    """
+    n = len(timestamps)
+    order = np.lexsort((timestamps, groups))
+    sorted_groups, sorted_times = groups[order], timestamps[order]
+    
+    # Rank timestamps and window starts together so (group, rank) packs into one sortable int
+    ranks = np.unique(np.concatenate([sorted_times, sorted_times - window]), return_inverse=True)[1]
+    width = ranks.max() + 1 if n else 1
+    keys = sorted_groups * width + ranks[:n]
     
-    with open(config_path, 'r') as f:
-        return yaml.safe_load(f)
+    bounds = np.empty((3, n), dtype=np.int64)
+    bounds[:, order] = [
+        np.searchsorted(keys, sorted_groups * width + ranks[n:], side='left'),
+        np.searchsorted(keys, keys, side='left'),
+        np.searchsorted(keys, keys, side='right')
+    ]
+    start, before, through = bounds
+    return order, start, before, through
+
+
+# Default high-risk Merchant Category Codes for the suspicious merchant rule
+HIGH_RISK_MCCS = frozenset({"7995", "7273", "5967", "5912"})
+
+def new_alert_ids(count):
+    """Draw `count` alert IDs ('ALT' + 12 random hex digits) from a single os.urandom call."""
+    digits = os.urandom(6 * count).hex().upper()
+    return ['ALT' + digits[i:i + 12] for i in range(0, 12 * count, 12)]
+
+
+# Bit per rule; a set of triggered rules is an index into the engine's score table
+RULE_BITS = {
+    'HIGH_AMOUNT': 1,
+    'VELOCITY': 2,
+    'GEO_JUMP': 4,
+    'DEVICE_SHARING': 8,
+    'UNUSUAL_TIME': 16,
+    'SUSPICIOUS_MERCHANT': 32
+}
+
+# Severity levels from lowest to highest; a score's level is the number of
+# ascending severity_thresholds it reaches
+SEVERITY_LEVELS = ('LOW', 'MEDIUM', 'HIGH', 'CRITICAL')
+
+# Alerts inserted per executemany in process_transactions
+ALERT_BATCH_SIZE = 10_000
+
+# Batches up to this size read only their own customers' and devices' history
+# (see detect_temporal_rules); larger ones read every customer's in their date range
+HISTORY_KEY_FILTER_MAX = 500
 
 
 class FraudDetectionEngine:
     """Fraud detection rules engine."""
     
-    def __init__(self):
+    def __init__(self, min_alert_score=0):
+        """min_alert_score: lowest risk score worth alerting on; 0 alerts on any triggered rule."""
         self.session = get_session()
-        self.config = load_config()
+        self.config = get_config()
+        self.min_alert_score = min_alert_score
+        rules = self.config.get('rules', {})
+        # Settings of the in-memory rules, read once instead of per transaction
+        high_amount = rules.get('high_amount', {})
+        self.high_amount_enabled = high_amount.get('enabled', True)
+        self.high_amount_threshold = high_amount.get('threshold', 5000)
+        unusual_time = rules.get('unusual_time', {})
+        self.unusual_time_enabled = unusual_time.get('enabled', True)
+        self.unusual_start_hour = unusual_time.get('start_hour', 2)
+        self.unusual_end_hour = unusual_time.get('end_hour', 5)
+        suspicious_merchant = rules.get('suspicious_merchant', {})
+        self.suspicious_merchant_enabled = suspicious_merchant.get('enabled', True)
+        # High-risk MCC codes from config, as a set for the per-transaction lookup
+        high_risk_mcc_codes = suspicious_merchant.get('high_risk_mcc_codes')
+        self.high_risk_mccs = HIGH_RISK_MCCS if high_risk_mcc_codes is None else frozenset(high_risk_mcc_codes)
+        # Lowest risk scores for MEDIUM, HIGH and CRITICAL severity (SEVERITY_LEVELS[1:])
+        thresholds = self.config.get('severity_thresholds', {})
+        self.severity_thresholds = (
+            thresholds.get('MEDIUM', 40), thresholds.get('HIGH', 60), thresholds.get('CRITICAL', 80)
+        )
+        # The enabled per-transaction rules' checks; the history-based rules run in detect_temporal_rules
+        self.checks = [
+            (rule_name, check_func) for rule_name, check_func in (
+                ('HIGH_AMOUNT', self.check_high_amount),
+                ('UNUSUAL_TIME', self.check_unusual_time),
+                ('SUSPICIOUS_MERCHANT', self.check_suspicious_merchant)
+            ) if rules.get(rule_name.lower(), {}).get('enabled', True)
+        ]
+        # RULE_BITS of the enabled history-based rules (see detect_temporal_rules)
+        self.temporal_rules_mask = sum(
+            RULE_BITS[rule_name] for rule_name in ('VELOCITY', 'GEO_JUMP', 'DEVICE_SHARING')
+            if rules.get(rule_name.lower(), {}).get('enabled', True)
+        )
+        # Summed rule weights for every combination of the known rules, by RULE_BITS mask
+        rule_weights = self.config.get('rule_weights', {})
+        default_weight = self.default_weight = rule_weights.get('DEFAULT', 5)
+        self.score_table = [
+            sum(rule_weights.get(rule, default_weight) for rule, bit in RULE_BITS.items() if mask & bit)
+            for mask in range(1 << len(RULE_BITS))
+        ]
     
     def calculate_risk_score(self, rules_triggered):
         """Calculate overall risk score (0-100) based on triggered rules."""
+        mask = 0
         base_score = 0
-        rule_weights = self.config.get('rule_weights', {})
-        default_weight = rule_weights.get('DEFAULT', 5)
-        
         for rule in rules_triggered:
-            base_score += rule_weights.get(rule, default_weight)
+            if rule in RULE_BITS:
+                mask |= RULE_BITS[rule]
+            else:
+                # Rules outside RULE_BITS score the default weight
+                base_score += self.default_weight
         
-        return min(100, base_score)
+        return min(100, self.score_table[mask] + base_score)
     
     def get_severity(self, risk_score):
         """Map risk score to severity level."""
-        thresholds = self.config.get('severity_thresholds', {})
-        critical = thresholds.get('CRITICAL', 80)
-        high = thresholds.get('HIGH', 60)
-        medium = thresholds.get('MEDIUM', 40)
-        
-        if risk_score >= critical:
-            return 'CRITICAL'
-        elif risk_score >= high:
-            return 'HIGH'
-        elif risk_score >= medium:
-            return 'MEDIUM'
-        else:
-            return 'LOW'
+        return SEVERITY_LEVELS[bisect_right(self.severity_thresholds, risk_score)]
     
     def check_high_amount(self, transaction):
         """Rule: Transaction amount exceeds threshold."""
-        rule_config = self.config.get('rules', {}).get('high_amount', {})
-        if not rule_config.get('enabled', True):
+        if not self.high_amount_enabled:
             return False, None
         
-        threshold = rule_config.get('threshold', 5000)
+        threshold = self.high_amount_threshold
         if transaction.amount > threshold:
             return True, f"Amount ${transaction.amount:,.2f} exceeds threshold ${threshold:,.2f}"
         return False, None
     
-    def check_velocity(self, transaction):
-        """Rule: Too many transactions in short time window."""
-        rule_config = self.config.get('rules', {}).get('velocity', {})
-        if not rule_config.get('enabled', True):
+    def check_unusual_time(self, transaction):
+        """Rule: Transaction at unusual time (e.g., 2-5 AM)."""
+        if not self.unusual_time_enabled:
             return False, None
         
-        time_window_hours = rule_config.get('time_window_hours', 1)
-        time_window = timedelta(hours=time_window_hours)
-        start_time = transaction.transaction_date - time_window
-        
-        count = self.session.query(func.count(Transaction.id)).filter(
-            and_(
-                Transaction.customer_id == transaction.customer_id,
-                Transaction.transaction_date >= start_time,
-                Transaction.transaction_date <= transaction.transaction_date,
-                Transaction.id != transaction.id
-            )
-        ).scalar()
+        hour = transaction.transaction_date.hour
         
-        threshold = rule_config.get('threshold', 5)
-        if count >= threshold:
-            return True, f"Customer made {count + 1} transactions in the last {time_window_hours} hour(s)"
+        # Flag transactions within the unusual time window
+        if self.unusual_start_hour <= hour <= self.unusual_end_hour:
+            return True, f"Transaction occurred at unusual time: {hour:02d}:{transaction.transaction_date.minute:02d}"
         return False, None
     
-    def check_geo_jump(self, transaction):
-        """Rule: Geographic location jump (impossible travel)."""
-        rule_config = self.config.get('rules', {}).get('geo_jump', {})
-        if not rule_config.get('enabled', True):
+    def check_suspicious_merchant(self, transaction):
+        """Rule: Transaction at high-risk merchant category."""
+        if not self.suspicious_merchant_enabled:
             return False, None
         
-        # Check for transactions in different locations within short time
-        time_window_hours = rule_config.get('time_window_hours', 2)
-        time_window = timedelta(hours=time_window_hours)
-        start_time = transaction.transaction_date - time_window
+        if transaction.mcc_code in self.high_risk_mccs:
+            return True, f"Transaction at high-risk merchant category (MCC: {transaction.mcc_code})"
+        return False, None
+    
+    def detect_temporal_rules(self, transactions):
+        """
+        Run the velocity, geo jump and device sharing rules for many transactions at once.
+        The history that can fall in the transactions' windows is read in one
+        query and each window is found by sorted search, instead of three queries
+        per transaction. The read is bounded by the batch's dates and the rule
+        windows; small batches (analyze_transaction's single transaction among
+        them) also keep to their own customers and devices, which the
+        (customer_id, transaction_date) and (device_id, transaction_date)
+        indexes serve.
+        Returns {rule name: {transaction id: detail}} for the enabled rules,
+        holding only the transactions that triggered them.
         
-        recent_transactions = self.session.query(Transaction).filter(
-            and_(
-                Transaction.customer_id == transaction.customer_id,
-                Transaction.transaction_date >= start_time,
-                Transaction.transaction_date < transaction.transaction_date,
-                Transaction.id != transaction.id
-            )
-        ).all()
+        This runs in a single process on purpose: device sharing windows span
+        customers, so customer shards would have to share the whole history,
+        and the sorted searches take a fraction of the alert insert time.
+        """
+        rules = self.config.get('rules', {})
+        if not transactions:
+            return {}
         
-        for recent_txn in recent_transactions:
-            if recent_txn.city != transaction.city or recent_txn.country != transaction.country:
-                return True, f"Location jump from {recent_txn.city}, {recent_txn.country} to {transaction.city}, {transaction.country} within {time_window.total_seconds()/3600:.1f} hours"
+        # How far back each enabled rule looks, over the customer's or the device's transactions
+        customer_windows = [
+            timedelta(hours=rules.get(rule, {}).get('time_window_hours', hours))
+            for rule, hours in (('velocity', 1), ('geo_jump', 2)) if rules.get(rule, {}).get('enabled', True)
+        ]
+        device_windows = [
+            timedelta(days=rules.get('device_sharing', {}).get('time_window_days', 7))
+        ] if rules.get('device_sharing', {}).get('enabled', True) else []
+        if not customer_windows and not device_windows:
+            return {}
         
-        return False, None
-    
-    def check_device_sharing(self, transaction):
-        """Rule: Same device used by multiple customers (potential card sharing)."""
-        rule_config = self.config.get('rules', {}).get('device_sharing', {})
-        if not rule_config.get('enabled', True):
-            return False, None
+        dates = [transaction.transaction_date for transaction in transactions]
+        first, last = min(dates), max(dates)
+        if len(transactions) > HISTORY_KEY_FILTER_MAX:
+            in_range = Transaction.transaction_date.between(first - max(customer_windows + device_windows), last)
+        else:
+            in_range = []
+            if customer_windows:
+                in_range.append(and_(
+                    Transaction.customer_id.in_({transaction.customer_id for transaction in transactions}),
+                    Transaction.transaction_date.between(first - max(customer_windows), last)
+                ))
+            if device_windows:
+                device_ids = {transaction.device_id for transaction in transactions}
+                in_device_range = Transaction.transaction_date.between(first - device_windows[0], last)
+                in_range.append(and_(Transaction.device_id.in_(device_ids - {None}), in_device_range))
+                # Transactions without a device share one, as the device_id IS NULL comparison did
+                if None in device_ids:
+                    in_range.append(and_(Transaction.device_id.is_(None), in_device_range))
+            # Separate OR terms, so SQLite can serve each from its own index
+            in_range = or_(*in_range)
         
-        # Count how many different customers used this device recently
-        time_window_days = rule_config.get('time_window_days', 7)
-        time_window = timedelta(days=time_window_days)
-        start_time = transaction.transaction_date - time_window
+        history = pd.read_sql(
+            select(Transaction.id, Transaction.customer_id, Transaction.device_id,
+                   Transaction.city, Transaction.country, Transaction.transaction_date).where(in_range),
+            self.session.connection()
+        )
+        # Text columns for the details as object arrays, so missing values print as None like the ORM's
+        details = {column: history[column].astype(object).where(history[column].notna(), None).to_numpy()
+                   for column in ('device_id', 'city', 'country')}
+        ids = history['id'].to_numpy()
+        is_candidate = np.isin(ids, [transaction.id for transaction in transactions])
+        timestamps = pd.to_datetime(history['transaction_date']).to_numpy('datetime64[ns]').view('int64')
+        customers = history.groupby('customer_id', dropna=False, sort=False).ngroup().to_numpy()
+        results = {}
         
-        unique_customers = self.session.query(func.count(func.distinct(Transaction.customer_id))).filter(
-            and_(
-                Transaction.device_id == transaction.device_id,
-                Transaction.transaction_date >= start_time,
-                Transaction.transaction_date <= transaction.transaction_date
+        rule_config = rules.get('velocity', {})
+        if rule_config.get('enabled', True):
+            time_window_hours = rule_config.get('time_window_hours', 1)
+            order, start, before, through = _window_bounds(
+                customers, timestamps, pd.Timedelta(hours=time_window_hours).value
             )
-        ).scalar()
+            # Other transactions by the customer within the window
+            count = through - start - 1
+            hit = is_candidate & (count >= rule_config.get('threshold', 5))
+            results['VELOCITY'] = {
+                transaction_id: f"Customer made {n + 1} transactions in the last {time_window_hours} hour(s)"
+                for transaction_id, n in zip(ids[hit].tolist(), count[hit].tolist())
+            }
         
-        threshold = rule_config.get('threshold', 3)
-        if unique_customers >= threshold:
-            return True, f"Device {transaction.device_id} used by {unique_customers} different customers in the last {time_window_days} days"
-        return False, None
+        rule_config = rules.get('geo_jump', {})
+        if rule_config.get('enabled', True):
+            time_window = timedelta(hours=rule_config.get('time_window_hours', 2))
+            locations = history.groupby(['city', 'country'], dropna=False, sort=False).ngroup().to_numpy()
+            order, start, before, _ = _window_bounds(customers, timestamps, pd.Timedelta(time_window).value)
+            # Earlier transactions in the window, and how many of them share this one's location
+            same_start, same_before = _window_bounds(
+                customers * (locations.max() + 1) + locations, timestamps, pd.Timedelta(time_window).value
+            )[1:3]
+            hit = np.flatnonzero(is_candidate & (before - start > same_before - same_start))
+            # The first window row elsewhere is the window start, or else where the start's run of one location ends
+            sorted_locations = locations[order]
+            run_ends = np.append(np.flatnonzero(sorted_locations[1:] != sorted_locations[:-1]) + 1, len(order))
+            first = start[hit]
+            first = np.where(sorted_locations[first] != locations[hit], first,
+                             run_ends[np.searchsorted(run_ends, first, side='right')])
+            previous = order[first]
+            results['GEO_JUMP'] = {
+                transaction_id: (
+                    f"Location jump from {from_city}, {from_country} to {to_city}, {to_country} "
+                    f"within {time_window.total_seconds()/3600:.1f} hours"
+                )
+                for transaction_id, from_city, from_country, to_city, to_country in zip(
+                    ids[hit].tolist(), details['city'][previous], details['country'][previous],
+                    details['city'][hit], details['country'][hit]
+                )
+            }
+        
+        rule_config = rules.get('device_sharing', {})
+        if rule_config.get('enabled', True):
+            time_window_days = rule_config.get('time_window_days', 7)
+            threshold = rule_config.get('threshold', 3)
+            devices = history.groupby('device_id', dropna=False, sort=False).ngroup().to_numpy()
+            order, start, _, through = _window_bounds(
+                devices, timestamps, pd.Timedelta(days=time_window_days).value
+            )
+            # Only devices with enough customers overall can reach the threshold in a window;
+            # null devices group together, as the IS NULL comparison did
+            shared = history.groupby('device_id', dropna=False)['customer_id'].transform('nunique').to_numpy()
+            results['DEVICE_SHARING'] = {}
+            for row in np.flatnonzero(is_candidate & (shared >= threshold)):
+                unique_customers = len(set(customers[order[start[row]:through[row]]].tolist()))
+                if unique_customers >= threshold:
+                    results['DEVICE_SHARING'][int(ids[row])] = (
+                        f"Device {details['device_id'][row]} used by {unique_customers} "
+                        f"different customers in the last {time_window_days} days"
+                    )
+        
+        return results
     
-    def check_unusual_time(self, transaction):
-        """Rule: Transaction at unusual time (e.g., 2-5 AM)."""
-        rule_config = self.config.get('rules', {}).get('unusual_time', {})
-        if not rule_config.get('enabled', True):
-            return False, None
+    def analyze_transaction(self, transaction):
+        """
+        Run all fraud detection rules on a transaction stored in the database.
+        The history-based rules go through detect_temporal_rules, like
+        build_alert_batch, so each rule has a single implementation.
+        No rules are reported for a transaction that scores below min_alert_score;
+        the history is not read when even every history-based rule could not lift
+        it that high.
+        """
+        results = {rule_name: check_func(transaction) for rule_name, check_func in self.checks}
+        mask = sum(RULE_BITS[rule_name] for rule_name, (triggered, _) in results.items() if triggered)
+        if self.score_table[mask | self.temporal_rules_mask] < self.min_alert_score:
+            return [], []
         
-        hour = transaction.transaction_date.hour
-        start_hour = rule_config.get('start_hour', 2)
-        end_hour = rule_config.get('end_hour', 5)
+        for rule_name, hits in self.detect_temporal_rules([transaction]).items():
+            detail = hits.get(transaction.id)
+            results[rule_name] = (detail is not None, detail)
         
-        # Flag transactions within the unusual time window
-        if start_hour <= hour <= end_hour:
-            return True, f"Transaction occurred at unusual time: {transaction.transaction_date.strftime('%H:%M')}"
-        return False, None
+        # Report triggered rules in RULE_BITS order
+        rules_triggered = [rule_name for rule_name in RULE_BITS if rule_name in results and results[rule_name][0]]
+        rule_details = [results[rule_name][1] for rule_name in rules_triggered]
+        
+        if self.calculate_risk_score(rules_triggered) < self.min_alert_score:
+            return [], []
+        return rules_triggered, rule_details
     
-    def check_suspicious_merchant(self, transaction):
-        """Rule: Transaction at high-risk merchant category."""
-        rule_config = self.config.get('rules', {}).get('suspicious_merchant', {})
-        if not rule_config.get('enabled', True):
-            return False, None
+    def build_alert_values(self, transaction, rules_triggered, rule_details):
+        """Column values for an alert on a suspicious transaction, except its alert_id."""
+        risk_score = self.calculate_risk_score(rules_triggered)
         
-        # High-risk MCC codes from config
-        high_risk_mccs = rule_config.get('high_risk_mcc_codes', ["7995", "7273", "5967", "5912"])
-        if transaction.mcc_code in high_risk_mccs:
-            return True, f"Transaction at high-risk merchant category (MCC: {transaction.mcc_code})"
-        return False, None
+        return {
+            'transaction_id': transaction.transaction_id,
+            'rule_triggered': ', '.join(rules_triggered),
+            'severity': self.get_severity(risk_score),
+            'risk_score': risk_score,
+            'status': 'OPEN',
+            'notes': ' | '.join(rule_details)
+        }
     
-    def analyze_transaction(self, transaction):
-        """Run all fraud detection rules on a transaction."""
-        rules_triggered = []
-        rule_details = []
+    def build_alert_batch(self, transactions):
+        """
+        Column values for the alerts on a batch of transactions, except their alert_ids.
+        Gives the alerts analyze_transaction and build_alert_values would, but
+        evaluates each rule as an array over the whole batch: the scores,
+        severities and rule lists come from per-mask lookups, and rule details
+        are formatted only for the transactions that go on to alert. With
+        min_alert_score set, the history-based rules only run for transactions
+        they could lift to it.
+        """
+        ids = pd.Index([transaction.id for transaction in transactions])
+        amounts = np.array([transaction.amount for transaction in transactions], dtype=float)
+        dates = pd.DatetimeIndex([transaction.transaction_date for transaction in transactions])
+        mcc_codes = pd.Index([transaction.mcc_code for transaction in transactions], dtype=object)
         
-        # Run all rules
-        checks = [
-            ('HIGH_AMOUNT', self.check_high_amount),
-            ('VELOCITY', self.check_velocity),
-            ('GEO_JUMP', self.check_geo_jump),
-            ('DEVICE_SHARING', self.check_device_sharing),
-            ('UNUSUAL_TIME', self.check_unusual_time),
-            ('SUSPICIOUS_MERCHANT', self.check_suspicious_merchant)
-        ]
+        # Which transactions trigger each enabled rule
+        hits = {}
+        for rule_name, _ in self.checks:
+            if rule_name == 'HIGH_AMOUNT':
+                hits[rule_name] = amounts > self.high_amount_threshold
+            elif rule_name == 'UNUSUAL_TIME':
+                hits[rule_name] = (dates.hour >= self.unusual_start_hour) & (dates.hour <= self.unusual_end_hour)
+            elif rule_name == 'SUSPICIOUS_MERCHANT':
+                hits[rule_name] = mcc_codes.isin(list(self.high_risk_mccs))
         
-        for rule_name, check_func in checks:
-            triggered, detail = check_func(transaction)
-            if triggered:
-                rules_triggered.append(rule_name)
-                rule_details.append(detail)
+        # Triggered rules as a RULE_BITS mask, scored and named by lookup
+        masks = np.zeros(len(transactions), dtype=np.int64)
+        for rule_name, hit in hits.items():
+            masks |= RULE_BITS[rule_name] * hit
+        reachable = np.array(self.score_table)[masks | self.temporal_rules_mask] >= self.min_alert_score
+        temporal = self.detect_temporal_rules(
+            [transaction for transaction, keep in zip(transactions, reachable.tolist()) if keep]
+        )
+        for rule_name, found in temporal.items():
+            hit = hits[rule_name] = ids.isin(list(found))
+            masks |= RULE_BITS[rule_name] * hit
+        scores = np.minimum(100, np.array(self.score_table)[masks])
+        rule_names = [', '.join(rule for rule, bit in RULE_BITS.items() if mask & bit)
+                      for mask in range(len(self.score_table))]
+        severities = np.array(SEVERITY_LEVELS)[np.searchsorted(self.severity_thresholds, scores, side='right')]
         
-        return rules_triggered, rule_details
+        alerts = (masks != 0) & (scores >= self.min_alert_score)
+        alerting = np.flatnonzero(alerts)
+        
+        # Each rule's detail, formatted only where it triggered on a transaction that alerts
+        details = {}
+        for rule_name, hit in hits.items():
+            detail = details[rule_name] = np.full(len(transactions), None, dtype=object)
+            hit = hit & alerts
+            if rule_name in temporal:
+                detail[hit] = [temporal[rule_name][transaction_id] for transaction_id in ids[hit].tolist()]
+            elif rule_name == 'HIGH_AMOUNT':
+                detail[hit] = [
+                    f"Amount ${amount:,.2f} exceeds threshold ${self.high_amount_threshold:,.2f}"
+                    for amount in amounts[hit].tolist()
+                ]
+            elif rule_name == 'UNUSUAL_TIME':
+                detail[hit] = [
+                    f"Transaction occurred at unusual time: {hour:02d}:{minute:02d}"
+                    for hour, minute in zip(dates.hour[hit].tolist(), dates.minute[hit].tolist())
+                ]
+            elif rule_name == 'SUSPICIOUS_MERCHANT':
+                detail[hit] = [
+                    f"Transaction at high-risk merchant category (MCC: {mcc_code})"
+                    for mcc_code in mcc_codes[hit].tolist()
+                ]
+        
+        # Details in RULE_BITS order, like analyze_transaction reports them
+        ordered_details = [details[rule] for rule in RULE_BITS if rule in details]
+        return [
+            {
+                'transaction_id': transactions[row].transaction_id,
+                'rule_triggered': rule_names[mask],
+                'severity': severity,
+                'risk_score': score,
+                'status': 'OPEN',
+                'notes': ' | '.join(detail[row] for detail in ordered_details if detail[row] is not None)
+            }
+            for row, mask, score, severity in zip(
+                alerting.tolist(), masks[alerting].tolist(), scores[alerting].tolist(), severities[alerting].tolist()
+            )
+        ]
     
     def generate_alert(self, transaction, rules_triggered, rule_details):
         """Generate an alert for a suspicious transaction."""
         if not rules_triggered:
             return None
         
-        risk_score = self.calculate_risk_score(rules_triggered)
-        severity = self.get_severity(risk_score)
-        
-        alert_id = 'ALT' + str(uuid.uuid4()).replace('-', '').upper()[:12]
-        
         alert = Alert(
-            alert_id=alert_id,
-            transaction_id=transaction.transaction_id,
-            rule_triggered=', '.join(rules_triggered),
-            severity=severity,
-            risk_score=risk_score,
-            status='OPEN',
-            notes=' | '.join(rule_details)
+            alert_id=new_alert_ids(1)[0],
+            **self.build_alert_values(transaction, rules_triggered, rule_details)
         )
         
         self.session.add(alert)
@@ -237,31 +433,47 @@ class FraudDetectionEngine:
         return alert
     
     def process_transactions(self, limit=None):
-        """Process transactions and generate alerts."""
+        """
+        Process transactions and generate alerts.
+        Alerts are inserted ALERT_BATCH_SIZE at a time with one executemany per
+        batch, and committed together at the end, instead of one ORM add and
+        commit per alert. Alerts lost to a failed run are regenerated by the next.
+        """
         # Get transactions that don't have alerts yet
-        query = self.session.query(Transaction).outerjoin(
-            Alert, Transaction.transaction_id == Alert.transaction_id
-        ).filter(Alert.id == None).order_by(Transaction.transaction_date.desc())
+        # (anti-join: NOT EXISTS probes ix_alert_txn per transaction).
+        # Plain rows with just the columns the rules read, not ORM objects;
+        # the rule checks only use attribute access, which rows support
+        query = select(
+            Transaction.id, Transaction.transaction_id, Transaction.customer_id, Transaction.amount,
+            Transaction.transaction_date, Transaction.device_id, Transaction.city,
+            Transaction.country, Transaction.mcc_code
+        ).where(
+            ~exists().where(Alert.transaction_id == Transaction.transaction_id)
+        ).order_by(Transaction.transaction_date.desc())
         
         if limit:
             query = query.limit(limit)
         
-        transactions = query.all()
+        transactions = self.session.execute(query).all()
         alerts_generated = 0
         
         print(f"Processing {len(transactions)} transactions...")
         
-        for transaction in transactions:
-            rules_triggered, rule_details = self.analyze_transaction(transaction)
-            
-            if rules_triggered:
-                alert = self.generate_alert(transaction, rules_triggered, rule_details)
-                if alert:
-                    alerts_generated += 1
+        alerts = self.build_alert_batch(transactions)
+        for start in range(0, len(alerts), ALERT_BATCH_SIZE):
+            alerts_generated += self._insert_alerts(alerts[start:start + ALERT_BATCH_SIZE])
+        self.session.commit()
         
         print(f"✓ Generated {alerts_generated} new alerts")
         return alerts_generated
     
+    def _insert_alerts(self, pending):
+        """Insert a batch of alert values (committed by the caller)."""
+        for values, alert_id in zip(pending, new_alert_ids(len(pending))):
+            values['alert_id'] = alert_id
+        self.session.execute(insert(Alert), pending)
+        return len(pending)
+    
     def close(self):
         """Close database session."""
         self.session.close()
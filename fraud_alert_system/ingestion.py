@@ -1,7 +1,9 @@
 """Data ingestion script to load CSV into database."""
 import pandas as pd
-from sqlalchemy.exc import IntegrityError
-from fraud_alert_system.database import get_session, Transaction
+from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from fraud_alert_system.database import get_engine, Transaction
 import sys
 import os
 
@@ -11,52 +13,83 @@ def load_transactions_from_csv(csv_path):
     if not os.path.exists(csv_path):
         raise FileNotFoundError(f"CSV file not found: {csv_path}")
     
-    df = pd.read_csv(csv_path)
-    df['transaction_date'] = pd.to_datetime(df['transaction_date'])
-    
-    session = get_session()
-    loaded = 0
-    skipped = 0
+    load_transactions_from_dataframe(pd.read_csv(csv_path))
+
+
+def load_transactions_from_parquet(parquet_path):
+    """Load transactions from Parquet file into database."""
+    load_transactions_from_dataframe(pd.read_parquet(parquet_path))
+
+
+def load_transactions_from_dataframe(df, defer_indexes=False):
+    """Load transactions from an in-memory DataFrame into database."""
+    load_transactions_to_db(df, get_engine(), defer_indexes=defer_indexes)
+
+
+def _insert_or_ignore(table, conn, keys, data_iter):
+    """to_sql insert method that skips rows whose transaction_id already exists."""
+    stmt = sqlite_insert(Transaction.__table__).on_conflict_do_nothing()
+    result = conn.execute(stmt, [dict(zip(keys, row)) for row in data_iter])
+    return result.rowcount
+
+
+def load_transactions_to_db(df, engine, chunksize=10_000, defer_indexes=False):
+    """
+    Bulk-insert transactions with one executemany per chunk in a single
+    transaction, instead of one ORM add and commit per row.
+    defer_indexes: for one-shot loads with nothing else using the database
+    (setup_database.py), drop the lookup indexes of an empty table for the
+    insert, then build them once and refresh the planner statistics. The
+    unique transaction_id index stays, as the duplicate check needs it.
+    """
+    df = pd.DataFrame({
+        'transaction_id': df['transaction_id'],
+        'customer_id': df['customer_id'],
+        'merchant': df['merchant'],
+        'amount': df['amount'].astype(float),
+        'currency': df['currency'] if 'currency' in df else 'USD',
+        'transaction_date': pd.to_datetime(df['transaction_date']),
+        'card_type': df.get('card_type'),
+        'device_id': df.get('device_id'),
+        'ip_address': df.get('ip_address'),
+        'country': df.get('country'),
+        'city': df.get('city'),
+        'mcc_code': df.get('mcc_code'),
+        'status': df['status'] if 'status' in df else 'completed',
+        'created_at': datetime.utcnow()
+    })
     
+    deferred = []
     try:
-        for _, row in df.iterrows():
-            try:
-                transaction = Transaction(
-                    transaction_id=row['transaction_id'],
-                    customer_id=row['customer_id'],
-                    merchant=row['merchant'],
-                    amount=float(row['amount']),
-                    currency=row.get('currency', 'USD'),
-                    transaction_date=row['transaction_date'],
-                    card_type=row.get('card_type'),
-                    device_id=row.get('device_id'),
-                    ip_address=row.get('ip_address'),
-                    country=row.get('country'),
-                    city=row.get('city'),
-                    mcc_code=row.get('mcc_code'),
-                    status=row.get('status', 'completed')
-                )
-                session.add(transaction)
-                session.commit()
-                loaded += 1
-            except IntegrityError:
-                session.rollback()
-                skipped += 1
-                continue
-        
-        print(f"✓ Loaded {loaded} transactions into database")
-        if skipped > 0:
-            print(f"⚠ Skipped {skipped} duplicate transactions")
-        
+        with engine.begin() as conn:
+            if defer_indexes and conn.execute(select(Transaction.id).limit(1)).first() is None:
+                deferred = [index for index in Transaction.__table__.indexes if not index.unique]
+            for index in deferred:
+                index.drop(conn)
+            loaded = df.to_sql(Transaction.__tablename__, conn, if_exists='append', index=False,
+                               chunksize=chunksize, method=_insert_or_ignore)
+            for index in deferred:
+                index.create(conn)
+            if deferred:
+                # Refresh planner statistics so SQLite picks the rebuilt composite rule indexes
+                conn.exec_driver_sql('ANALYZE')
     except Exception as e:
-        session.rollback()
         print(f"✗ Error loading transactions: {e}")
+        # pysqlite runs the DDL outside the insert's transaction, so the rollback keeps the drops
+        for index in deferred:
+            index.create(engine, checkfirst=True)
         raise
-    finally:
-        session.close()
+    
+    skipped = len(df) - loaded
+    print(f"✓ Loaded {loaded} transactions into database")
+    if skipped > 0:
+        print(f"⚠ Skipped {skipped} duplicate transactions")
 
 
 if __name__ == '__main__':
-    csv_path = sys.argv[1] if len(sys.argv) > 1 else 'data/transactions.csv'
-    load_transactions_from_csv(csv_path)
+    path = sys.argv[1] if len(sys.argv) > 1 else 'data/transactions.csv'
+    if path.endswith('.parquet'):
+        load_transactions_from_parquet(path)
+    else:
+        load_transactions_from_csv(path)
 
@@ -1,42 +1,25 @@
 """Alert prioritization and queue management utilities."""
 from datetime import datetime, timedelta
 from fraud_alert_system.database import Alert
-import yaml
-import os
-
-
-def load_config():
-    """Load configuration from config.yaml file."""
-    config_path = os.path.join(os.path.dirname(__file__), '..', 'config.yaml')
-    if not os.path.exists(config_path):
-        return {
-            'sla_thresholds': {
-                'CRITICAL': 15,
-                'HIGH': 60,
-                'MEDIUM': 240,
-                'LOW': 1440
-            },
-            'priority_calculation': {
-                'risk_score_weight': 0.6,
-                'age_penalty_weight': 0.4,
-                'max_priority_score': 100,
-                'age_penalty_before_sla_max': 40,
-                'age_penalty_after_sla_max': 60
-            }
-        }
-    
-    with open(config_path, 'r') as f:
-        return yaml.safe_load(f)
+from fraud_alert_system.config import get_config
+from sqlalchemy import case
+import numpy as np
 
 
-def get_config():
-    """Get cached config or load it."""
-    if not hasattr(get_config, '_config'):
-        get_config._config = load_config()
-    return get_config._config
+def get_sla_thresholds():
+    """Get cached SLA thresholds in minutes by severity."""
+    if not hasattr(get_sla_thresholds, '_thresholds'):
+        sla_thresholds_config = get_config().get('sla_thresholds', {})
+        get_sla_thresholds._thresholds = {
+            'CRITICAL': sla_thresholds_config.get('CRITICAL', 15),
+            'HIGH': sla_thresholds_config.get('HIGH', 60),
+            'MEDIUM': sla_thresholds_config.get('MEDIUM', 240),
+            'LOW': sla_thresholds_config.get('LOW', 1440)
+        }
+    return get_sla_thresholds._thresholds
 
 
-def calculate_priority_score(alert):
+def calculate_priority_score(alert, now=None):
     """
     Calculate priority score combining risk score and age.
     Higher score = higher priority.
@@ -44,9 +27,7 @@ def calculate_priority_score(alert):
     Formula: (Risk Score × 0.6) + (Age Penalty × 0.4)
     Age Penalty increases with time past SLA threshold.
     """
-    config = get_config()
-    priority_config = config.get('priority_calculation', {})
-    sla_thresholds_config = config.get('sla_thresholds', {})
+    priority_config = get_config().get('priority_calculation', {})
     
     risk_weight = priority_config.get('risk_score_weight', 0.6)
     age_weight = priority_config.get('age_penalty_weight', 0.4)
@@ -57,15 +38,11 @@ def calculate_priority_score(alert):
     risk_component = alert.risk_score * risk_weight
     
     # SLA thresholds by severity (in minutes)
-    sla_thresholds = {
-        'CRITICAL': sla_thresholds_config.get('CRITICAL', 15),
-        'HIGH': sla_thresholds_config.get('HIGH', 60),
-        'MEDIUM': sla_thresholds_config.get('MEDIUM', 240),
-        'LOW': sla_thresholds_config.get('LOW', 1440)
-    }
+    sla_thresholds = get_sla_thresholds()
     
     # Calculate age in minutes
-    age_minutes = (datetime.utcnow() - alert.created_at).total_seconds() / 60
+    now = now or datetime.utcnow()
+    age_minutes = (now - alert.created_at).total_seconds() / 60
     sla_threshold = sla_thresholds.get(alert.severity, 1440)
     
     # Age penalty: 0-100 based on how far past SLA
@@ -80,19 +57,12 @@ def calculate_priority_score(alert):
     return min(max_score, priority_score)
 
 
-def get_sla_status(alert):
+def get_sla_status(alert, now=None):
     """Get SLA status for an alert."""
-    config = get_config()
-    sla_thresholds_config = config.get('sla_thresholds', {})
-    
-    sla_thresholds = {
-        'CRITICAL': sla_thresholds_config.get('CRITICAL', 15),
-        'HIGH': sla_thresholds_config.get('HIGH', 60),
-        'MEDIUM': sla_thresholds_config.get('MEDIUM', 240),
-        'LOW': sla_thresholds_config.get('LOW', 1440)
-    }
+    sla_thresholds = get_sla_thresholds()
     
-    age_minutes = (datetime.utcnow() - alert.created_at).total_seconds() / 60
+    now = now or datetime.utcnow()
+    age_minutes = (now - alert.created_at).total_seconds() / 60
     sla_threshold = sla_thresholds.get(alert.severity, 1440)
     
     if age_minutes > sla_threshold:
@@ -103,28 +73,69 @@ def get_sla_status(alert):
         return 'OK'
 
 
-def get_time_to_sla(alert):
-    """Get time remaining until SLA breach (in minutes)."""
-    config = get_config()
-    sla_thresholds_config = config.get('sla_thresholds', {})
+def _age_and_threshold_minutes(severity, created_at, now=None):
+    """Alert ages and SLA thresholds in minutes, for Series of severities and creation times."""
+    sla_thresholds = get_sla_thresholds()
+    
+    now = now or datetime.utcnow()
+    age_minutes = (now - created_at).dt.total_seconds() / 60
+    sla_threshold = severity.map(sla_thresholds).fillna(1440).astype(float)
+    return age_minutes, sla_threshold
+
+
+def calculate_priority_scores(severity, risk_score, created_at, now=None):
+    """Vectorized calculate_priority_score over Series of alert columns."""
+    priority_config = get_config().get('priority_calculation', {})
+    risk_weight = priority_config.get('risk_score_weight', 0.6)
+    age_weight = priority_config.get('age_penalty_weight', 0.4)
+    max_score = priority_config.get('max_priority_score', 100)
+    before_sla_max = priority_config.get('age_penalty_before_sla_max', 40)
+    after_sla_max = priority_config.get('age_penalty_after_sla_max', 60)
+    
+    age_minutes, sla_threshold = _age_and_threshold_minutes(severity, created_at, now)
+    age_penalty = np.where(
+        age_minutes <= sla_threshold,
+        (age_minutes / sla_threshold) * before_sla_max,
+        before_sla_max + np.minimum(after_sla_max, ((age_minutes - sla_threshold) / sla_threshold) * after_sla_max)
+    )
+    return np.minimum(max_score, risk_score * risk_weight + age_penalty * age_weight)
+
+
+def get_sla_statuses(severity, created_at, now=None):
+    """Vectorized get_sla_status over Series of alert columns."""
+    age_minutes, sla_threshold = _age_and_threshold_minutes(severity, created_at, now)
+    return np.select(
+        [age_minutes > sla_threshold, age_minutes > sla_threshold * 0.8],
+        ['PAST_SLA', 'APPROACHING_SLA'],
+        default='OK'
+    )
+
+
+def get_times_to_sla(severity, created_at, now=None):
+    """Vectorized get_time_to_sla over Series of alert columns."""
+    age_minutes, sla_threshold = _age_and_threshold_minutes(severity, created_at, now)
+    return sla_threshold - age_minutes
+
+
+def past_sla_condition(now=None):
+    """
+    SQL condition matching alerts older than their severity's SLA threshold,
+    i.e. the alerts get_sla_status reports as PAST_SLA.
+    """
+    sla_thresholds = get_sla_thresholds()
     
-    sla_thresholds = {
-        'CRITICAL': sla_thresholds_config.get('CRITICAL', 15),
-        'HIGH': sla_thresholds_config.get('HIGH', 60),
-        'MEDIUM': sla_thresholds_config.get('MEDIUM', 240),
-        'LOW': sla_thresholds_config.get('LOW', 1440)
-    }
+    now = now or datetime.utcnow()
+    cutoffs = {severity: now - timedelta(minutes=minutes) for severity, minutes in sla_thresholds.items()}
+    return Alert.created_at < case(cutoffs, value=Alert.severity, else_=now - timedelta(minutes=1440))
+
+
+def get_time_to_sla(alert, now=None):
+    """Get time remaining until SLA breach (in minutes)."""
+    sla_thresholds = get_sla_thresholds()
     
-    age_minutes = (datetime.utcnow() - alert.created_at).total_seconds() / 60
+    now = now or datetime.utcnow()
+    age_minutes = (now - alert.created_at).total_seconds() / 60
     sla_threshold = sla_thresholds.get(alert.severity, 1440)
     
     remaining = sla_threshold - age_minutes
     return remaining
-
-
-def sort_alerts_by_priority(alerts):
-    """Sort alerts by priority score (highest first)."""
-    alerts_with_priority = [(alert, calculate_priority_score(alert)) for alert in alerts]
-    alerts_with_priority.sort(key=lambda x: x[1], reverse=True)
-    return [alert for alert, _ in alerts_with_priority]
-
@@ -1,9 +1,12 @@
 """Daily report generator for alerts and audit logs."""
 import pandas as pd
-from fraud_alert_system.database import get_session, Alert, Transaction, AuditLog
+from fraud_alert_system.database import get_session, Alert, AlertNote, Transaction, AuditLog
 from datetime import datetime, timedelta
-from sqlalchemy import func
+from sqlalchemy import func, select
 import os
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
@@ -11,6 +14,19 @@ from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib.units import inch
 
 
+def _append_sheet(workbook, title, df):
+    """Stream a DataFrame into a new sheet of a write-only workbook, bold header row first."""
+    sheet = workbook.create_sheet(title)
+    header = []
+    for column in df.columns:
+        cell = WriteOnlyCell(sheet, value=column)
+        cell.font = Font(bold=True)
+        header.append(cell)
+    sheet.append(header)
+    for row in df.astype(object).where(df.notna(), None).itertuples(index=False, name=None):
+        sheet.append(row)
+
+
 def export_alerts_to_excel(filepath='data/daily_report.xlsx', days=1):
     """Export alerts and audit logs to Excel file."""
     session = get_session()
@@ -18,90 +34,115 @@ def export_alerts_to_excel(filepath='data/daily_report.xlsx', days=1):
     try:
         start_date = datetime.now() - timedelta(days=days)
         
-        # Get alerts
-        alerts = session.query(Alert).filter(
-            Alert.created_at >= start_date
-        ).order_by(Alert.created_at.desc()).all()
+        # Get alerts joined to their transactions, as plain column rows (no ORM objects)
+        alerts = session.execute(
+            select(
+                Alert.alert_id, Alert.transaction_id, Transaction.customer_id, Transaction.merchant,
+                Transaction.amount, Alert.severity, Alert.risk_score, Alert.status, Alert.rule_triggered,
+                Alert.analyst_id, Alert.created_at, Alert.resolved_at, Alert.notes
+            ).outerjoin(
+                Transaction, Transaction.transaction_id == Alert.transaction_id
+            ).where(
+                Alert.created_at >= start_date
+            ).order_by(Alert.created_at.desc())
+        ).all()
+        
+        # Get analyst notes on those alerts, oldest first
+        alert_notes = session.execute(
+            select(
+                AlertNote.alert_id, AlertNote.created_at, AlertNote.note_text
+            ).join(
+                Alert, Alert.alert_id == AlertNote.alert_id
+            ).where(
+                Alert.created_at >= start_date
+            ).order_by(AlertNote.created_at)
+        ).all()
         
         # Get audit logs
-        audit_logs = session.query(AuditLog).filter(
-            AuditLog.timestamp >= start_date
-        ).order_by(AuditLog.timestamp.desc()).all()
+        audit_logs = session.execute(
+            select(
+                AuditLog.log_id, AuditLog.alert_id, AuditLog.analyst_id,
+                AuditLog.action, AuditLog.details, AuditLog.timestamp
+            ).where(
+                AuditLog.timestamp >= start_date
+            ).order_by(AuditLog.timestamp.desc())
+        ).all()
         
-        # Prepare alert data
-        alert_data = []
-        for alert in alerts:
-            transaction = session.query(Transaction).filter(
-                Transaction.transaction_id == alert.transaction_id
-            ).first()
-            
-            alert_data.append({
-                'Alert ID': alert.alert_id,
-                'Transaction ID': alert.transaction_id,
-                'Customer ID': transaction.customer_id if transaction else 'N/A',
-                'Merchant': transaction.merchant if transaction else 'N/A',
-                'Amount': f"${transaction.amount:,.2f}" if transaction else 'N/A',
-                'Severity': alert.severity,
-                'Risk Score': alert.risk_score,
-                'Status': alert.status,
-                'Rule Triggered': alert.rule_triggered,
-                'Analyst': alert.analyst_id or 'Unassigned',
-                'Created At': alert.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-                'Resolved At': alert.resolved_at.strftime('%Y-%m-%d %H:%M:%S') if alert.resolved_at else 'N/A',
-                'Notes': alert.notes or ''
-            })
+        # Prepare alert data: raw columns first, then formatted column-wise
+        df_alerts = pd.DataFrame.from_records(alerts, columns=[
+            'Alert ID', 'Transaction ID', 'Customer ID', 'Merchant', 'Amount', 'Severity', 'Risk Score',
+            'Status', 'Rule Triggered', 'Analyst', 'Created At', 'Resolved At', 'Notes'
+        ], nrows=len(alerts))
+        df_notes = pd.DataFrame.from_records(
+            alert_notes, columns=['alert_id', 'created_at', 'note_text'], nrows=len(alert_notes)
+        )
+        analyst_notes = df_alerts['Alert ID'].map(
+            ('[' + pd.to_datetime(df_notes['created_at']).dt.strftime('%Y-%m-%d %H:%M') + '] ' + df_notes['note_text'].astype(str))
+            .groupby(df_notes['alert_id'], sort=False).agg('\n\n'.join)
+        ).fillna('').astype(str)
+        detection_notes = df_alerts['Notes'].fillna('').astype(str)
+        df_alerts = df_alerts.assign(**{
+            'Customer ID': df_alerts['Customer ID'].fillna('N/A'),
+            'Merchant': df_alerts['Merchant'].fillna('N/A'),
+            'Amount': df_alerts['Amount'].astype('float64').map(
+                lambda amount: f"${amount:,.2f}", na_action='ignore'
+            ).fillna('N/A'),
+            'Analyst': df_alerts['Analyst'].fillna('').replace('', 'Unassigned'),
+            'Created At': pd.to_datetime(df_alerts['Created At']).dt.strftime('%Y-%m-%d %H:%M:%S'),
+            'Resolved At': pd.to_datetime(df_alerts['Resolved At']).dt.strftime('%Y-%m-%d %H:%M:%S').fillna('N/A'),
+            # Detection notes, then analyst notes
+            'Notes': detection_notes.where(
+                (detection_notes == '') | (analyst_notes == ''), detection_notes + '\n\n'
+            ) + analyst_notes
+        })
         
         # Prepare audit log data
-        audit_data = []
-        for log in audit_logs:
-            audit_data.append({
-                'Log ID': log.log_id,
-                'Alert ID': log.alert_id,
-                'Analyst ID': log.analyst_id,
-                'Action': log.action,
-                'Details': log.details or '',
-                'Timestamp': log.timestamp.strftime('%Y-%m-%d %H:%M:%S')
-            })
-        
-        # Create Excel file with multiple sheets
+        df_audit = pd.DataFrame.from_records(audit_logs, columns=[
+            'Log ID', 'Alert ID', 'Analyst ID', 'Action', 'Details', 'Timestamp'
+        ], nrows=len(audit_logs))
+        df_audit = df_audit.assign(
+            Details=df_audit['Details'].fillna(''),
+            Timestamp=pd.to_datetime(df_audit['Timestamp']).dt.strftime('%Y-%m-%d %H:%M:%S')
+        )
+        
+        # Summary counts, in one pass per column over the fetched alerts
+        status_counts = df_alerts['Status'].value_counts()
+        severity_counts = df_alerts['Severity'].value_counts()
+        summary_data = {
+            'Metric': [
+                'Total Alerts',
+                'Open Alerts',
+                'Resolved Alerts',
+                'Escalated Alerts',
+                'Critical Alerts',
+                'High Alerts',
+                'Medium Alerts',
+                'Low Alerts',
+                'Total Audit Actions'
+            ],
+            'Count': [
+                len(alerts),
+                status_counts.get('OPEN', 0),
+                status_counts.get('RESOLVED', 0),
+                status_counts.get('ESCALATED', 0),
+                severity_counts.get('CRITICAL', 0),
+                severity_counts.get('HIGH', 0),
+                severity_counts.get('MEDIUM', 0),
+                severity_counts.get('LOW', 0),
+                len(audit_logs)
+            ]
+        }
+        df_summary = pd.DataFrame(summary_data)
+        
+        # Create Excel file with multiple sheets; a write-only workbook streams
+        # rows to disk instead of building a cell object per value
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
         
-        with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-            # Alerts sheet
-            df_alerts = pd.DataFrame(alert_data)
-            df_alerts.to_excel(writer, sheet_name='Alerts', index=False)
-            
-            # Audit Log sheet
-            df_audit = pd.DataFrame(audit_data)
-            df_audit.to_excel(writer, sheet_name='Audit Log', index=False)
-            
-            # Summary sheet
-            summary_data = {
-                'Metric': [
-                    'Total Alerts',
-                    'Open Alerts',
-                    'Resolved Alerts',
-                    'Escalated Alerts',
-                    'Critical Alerts',
-                    'High Alerts',
-                    'Medium Alerts',
-                    'Low Alerts',
-                    'Total Audit Actions'
-                ],
-                'Count': [
-                    len(alerts),
-                    len([a for a in alerts if a.status == 'OPEN']),
-                    len([a for a in alerts if a.status == 'RESOLVED']),
-                    len([a for a in alerts if a.status == 'ESCALATED']),
-                    len([a for a in alerts if a.severity == 'CRITICAL']),
-                    len([a for a in alerts if a.severity == 'HIGH']),
-                    len([a for a in alerts if a.severity == 'MEDIUM']),
-                    len([a for a in alerts if a.severity == 'LOW']),
-                    len(audit_logs)
-                ]
-            }
-            df_summary = pd.DataFrame(summary_data)
-            df_summary.to_excel(writer, sheet_name='Summary', index=False)
+        workbook = Workbook(write_only=True)
+        _append_sheet(workbook, 'Alerts', df_alerts)
+        _append_sheet(workbook, 'Audit Log', df_audit)
+        _append_sheet(workbook, 'Summary', df_summary)
+        workbook.save(filepath)
         
         print(f"✓ Exported report to {filepath}")
         print(f"  - {len(alerts)} alerts")
@@ -123,16 +164,25 @@ def export_alerts_to_pdf(filepath='data/daily_report.pdf', days=1):
     try:
         start_date = datetime.now() - timedelta(days=days)
         
-        # Get alerts
-        alerts = session.query(Alert).filter(
-            Alert.created_at >= start_date
-        ).order_by(Alert.created_at.desc()).all()
+        # Get the 20 most recent alerts (only the columns the report shows)
+        alerts = session.execute(
+            select(
+                Alert.alert_id, Alert.severity, Alert.status, Alert.risk_score, Alert.created_at
+            ).where(
+                Alert.created_at >= start_date
+            ).order_by(Alert.created_at.desc()).limit(20)
+        ).all()
         
-        # Get summary statistics
-        total_alerts = len(alerts)
-        open_alerts = len([a for a in alerts if a.status == 'OPEN'])
-        resolved_alerts = len([a for a in alerts if a.status == 'RESOLVED'])
-        critical_alerts = len([a for a in alerts if a.severity == 'CRITICAL'])
+        # Get summary statistics, counted by the database
+        counts = session.execute(
+            select(Alert.status, Alert.severity, func.count()).where(
+                Alert.created_at >= start_date
+            ).group_by(Alert.status, Alert.severity)
+        ).all()
+        total_alerts = sum(count for _, _, count in counts)
+        open_alerts = sum(count for status, _, count in counts if status == 'OPEN')
+        resolved_alerts = sum(count for status, _, count in counts if status == 'RESOLVED')
+        critical_alerts = sum(count for _, severity, count in counts if severity == 'CRITICAL')
         
         # Create PDF
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
@@ -182,7 +232,7 @@ def export_alerts_to_pdf(filepath='data/daily_report.pdf', days=1):
         story.append(alerts_title)
         
         alerts_data = [['Alert ID', 'Severity', 'Status', 'Risk Score', 'Created']]
-        for alert in alerts[:20]:
+        for alert in alerts:
             alerts_data.append([
                 alert.alert_id[:10] + '...',
                 alert.severity,
@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
 """Setup script to initialize database and load sample data."""
 from fraud_alert_system.database import create_database
-from fraud_alert_system.data_generator import generate_transactions, save_transactions_to_csv
-from fraud_alert_system.ingestion import load_transactions_from_csv
+from fraud_alert_system.data_generator import generate_transactions, save_transactions
+from fraud_alert_system.ingestion import load_transactions_from_dataframe
 from fraud_alert_system.fraud_engine import FraudDetectionEngine
 
 import os
@@ -21,12 +21,12 @@ def main():
     # Step 2: Generate sample transactions
     print("\n[2/4] Generating sample transaction data...")
     df = generate_transactions(num_transactions=500, days_back=30)
-    csv_path = save_transactions_to_csv(df, 'data/transactions.csv')
+    save_transactions(df, 'data/transactions.parquet')
     print(f"✓ Generated {len(df)} transactions")
     
     # Step 3: Load transactions into database
     print("\n[3/4] Loading transactions into database...")
-    load_transactions_from_csv(csv_path)
+    load_transactions_from_dataframe(df, defer_indexes=True)
     print("✓ Transactions loaded")
     
     # Step 4: Run fraud detection engine
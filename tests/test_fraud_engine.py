@@ -1,19 +1,51 @@
 """Unit tests for fraud detection engine."""
 import pytest
-from fraud_alert_system.database import create_database, get_session, Transaction, Alert
+from fraud_alert_system import database
+from fraud_alert_system.database import create_database, Transaction
 from fraud_alert_system.fraud_engine import FraudDetectionEngine
 from datetime import datetime, timedelta
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+
+@pytest.fixture(scope='session')
+def db_engine():
+    """Create the test database once per test run, in memory instead of data/fraudops.db."""
+    # One shared connection keeps the in-memory database alive for every session
+    engine = create_engine('sqlite://', connect_args={'check_same_thread': False}, poolclass=StaticPool)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        # get_engine() hands out this engine, so the fraud engine's sessions use it too
+        monkeypatch.setattr(database, '_ENGINE', engine)
+        yield create_database()
+    engine.dispose()
 
 
 @pytest.fixture
-def db_session():
-    """Create a test database session."""
-    engine = create_database()
-    Session = sessionmaker(bind=engine)
-    session = Session()
-    yield session
-    session.close()
+def db_session(db_engine):
+    """Create a test database session whose changes are rolled back after the test."""
+    connection = db_engine.connect()
+    # pysqlite defers BEGIN and mishandles SAVEPOINT, so take over transaction control
+    connection.connection.driver_connection.isolation_level = None
+    transaction = connection.begin()
+    connection.exec_driver_sql('BEGIN')
+    # Commits inside the test release savepoints instead of ending the outer transaction
+    session = Session(bind=connection, join_transaction_mode='create_savepoint')
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.connection.driver_connection.isolation_level = ''
+        connection.close()
+
+
+@pytest.fixture(scope='session')
+def fraud_engine(db_engine):
+    """Create one fraud detection engine shared by the tests."""
+    engine = FraudDetectionEngine()
+    yield engine
+    engine.close()
 
 
 @pytest.fixture
@@ -35,13 +67,13 @@ def sample_transaction(db_session):
         status='completed'
     )
     db_session.add(transaction)
-    db_session.commit()
+    db_session.flush()
     return transaction
 
 
-def test_high_amount_rule():
+def test_high_amount_rule(fraud_engine):
     """Test high amount fraud rule."""
-    engine = FraudDetectionEngine()
+    engine = fraud_engine
     
     # Create a high-value transaction
     transaction = Transaction(
@@ -67,13 +99,11 @@ def test_high_amount_rule():
     transaction.amount = 100.00
     triggered, detail = engine.check_high_amount(transaction)
     assert triggered is False
-    
-    engine.close()
 
 
-def test_unusual_time_rule():
+def test_unusual_time_rule(fraud_engine):
     """Test unusual time fraud rule."""
-    engine = FraudDetectionEngine()
+    engine = fraud_engine
     
     # Transaction at 3 AM
     transaction = Transaction(
@@ -98,13 +128,11 @@ def test_unusual_time_rule():
     transaction.transaction_date = datetime.now().replace(hour=14, minute=0)
     triggered, detail = engine.check_unusual_time(transaction)
     assert triggered is False
-    
-    engine.close()
 
 
-def test_risk_score_calculation():
+def test_risk_score_calculation(fraud_engine):
     """Test risk score calculation."""
-    engine = FraudDetectionEngine()
+    engine = fraud_engine
     
     # Single rule triggered
     score = engine.calculate_risk_score(['HIGH_AMOUNT'])
@@ -117,25 +145,23 @@ def test_risk_score_calculation():
     # Risk score should cap at 100
     score = engine.calculate_risk_score(['HIGH_AMOUNT', 'VELOCITY', 'GEO_JUMP', 'DEVICE_SHARING', 'UNUSUAL_TIME', 'SUSPICIOUS_MERCHANT'])
     assert score <= 100
-    
-    engine.close()
 
 
-def test_severity_mapping():
+def test_severity_mapping(fraud_engine):
     """Test severity level mapping from risk score."""
-    engine = FraudDetectionEngine()
+    engine = fraud_engine
     
     assert engine.get_severity(90) == 'CRITICAL'
     assert engine.get_severity(70) == 'HIGH'
     assert engine.get_severity(50) == 'MEDIUM'
     assert engine.get_severity(30) == 'LOW'
-    
-    engine.close()
 
 
-def test_alert_generation(db_session, sample_transaction):
+def test_alert_generation(db_session, sample_transaction, fraud_engine, monkeypatch):
     """Test alert generation."""
-    engine = FraudDetectionEngine()
+    engine = fraud_engine
+    # Run the engine in the test's session so the alert is rolled back too
+    monkeypatch.setattr(engine, 'session', db_session)
     
     # Create a transaction that should trigger high amount rule
     high_amount_txn = Transaction(
@@ -164,8 +190,138 @@ def test_alert_generation(db_session, sample_transaction):
         assert alert.transaction_id == high_amount_txn.transaction_id
         assert alert.severity in ['LOW', 'MEDIUM', 'HIGH', 'CRITICAL']
         assert 0 <= alert.risk_score <= 100
+
+
+def test_min_alert_score_filtering(db_session, fraud_engine, monkeypatch):
+    """Test that transactions scoring below min_alert_score raise no alert."""
+    engine = fraud_engine
+    monkeypatch.setattr(engine, 'session', db_session)
+    monkeypatch.setattr(engine, 'min_alert_score', 40)
     
-    engine.close()
+    transactions = [
+        # High amount only: 30 points
+        Transaction(transaction_id='MIN_SCORE_LOW', customer_id='CUST_MIN_1', merchant='Merchant',
+                    amount=8000.00, transaction_date=datetime(2024, 1, 15, 12, 0),
+                    device_id='DEV_MIN_1', country='USA', city='NYC', mcc_code='5411'),
+        # High amount at an unusual time: 40 points
+        Transaction(transaction_id='MIN_SCORE_MEDIUM', customer_id='CUST_MIN_2', merchant='Merchant',
+                    amount=8000.00, transaction_date=datetime(2024, 1, 15, 3, 0),
+                    device_id='DEV_MIN_2', country='USA', city='NYC', mcc_code='5411')
+    ]
+    db_session.add_all(transactions)
+    db_session.flush()
+    
+    alerts = engine.build_alert_batch(transactions)
+    assert [alert['transaction_id'] for alert in alerts] == ['MIN_SCORE_MEDIUM']
+    assert alerts[0]['rule_triggered'] == 'HIGH_AMOUNT, UNUSUAL_TIME'
+    assert alerts[0]['risk_score'] == 40
+    
+    assert engine.analyze_transaction(transactions[0]) == ([], [])
+    assert engine.analyze_transaction(transactions[1])[0] == ['HIGH_AMOUNT', 'UNUSUAL_TIME']
+
+
+# Noon on a weekday: no unusual-time alerts, so only the history-based rules fire
+BASE_TIME = datetime(2024, 1, 15, 12, 0)
+
+
+def add_transactions(db_session, rows):
+    """Store transactions given as (transaction_id, customer_id, transaction_date, device_id, city) tuples."""
+    transactions = [
+        Transaction(transaction_id=transaction_id, customer_id=customer_id, merchant='Merchant',
+                    amount=100.00, transaction_date=transaction_date, device_id=device_id,
+                    country='USA', city=city, mcc_code='5411')
+        for transaction_id, customer_id, transaction_date, device_id, city in rows
+    ]
+    db_session.add_all(transactions)
+    db_session.flush()
+    return transactions
+
+
+def batch_rules(engine, transactions):
+    """Run build_alert_batch, check it against analyze_transaction + build_alert_values, and return its rules by transaction."""
+    alerts = engine.build_alert_batch(transactions)
+    expected = []
+    for transaction in transactions:
+        rules_triggered, rule_details = engine.analyze_transaction(transaction)
+        if rules_triggered:
+            expected.append(engine.build_alert_values(transaction, rules_triggered, rule_details))
+    assert alerts == expected
+    return {alert['transaction_id']: alert['rule_triggered'] for alert in alerts}
+
+
+def test_velocity_window_edges(db_session, fraud_engine, monkeypatch):
+    """Test velocity with identical timestamps and transactions exactly on the window start."""
+    engine = fraud_engine
+    monkeypatch.setattr(engine, 'session', db_session)
+    
+    rows = []
+    for customer_id, oldest in (('CUST_EDGE', BASE_TIME - timedelta(hours=1)),
+                                ('CUST_PAST', BASE_TIME - timedelta(hours=1, seconds=1))):
+        # Five transactions at the same moment, one more an hour (or just over) earlier
+        rows += [(f'{customer_id}_{i}', customer_id, BASE_TIME, 'DEV_V', 'NYC') for i in range(5)]
+        rows.append((f'{customer_id}_OLD', customer_id, oldest, 'DEV_V', 'NYC'))
+    transactions = add_transactions(db_session, rows)
+    
+    rules = batch_rules(engine, transactions)
+    # Same-time transactions count each other; the window start is inclusive
+    assert rules == {f'CUST_EDGE_{i}': 'VELOCITY' for i in range(5)}
+
+
+def test_geo_jump_window_edges(db_session, fraud_engine, monkeypatch):
+    """Test geo jump on the window start and between transactions at the same time."""
+    engine = fraud_engine
+    monkeypatch.setattr(engine, 'session', db_session)
+    
+    transactions = add_transactions(db_session, [
+        ('GEO_EDGE_FROM', 'CUST_GEO_1', BASE_TIME - timedelta(hours=2), 'DEV_G1', 'Paris'),
+        ('GEO_EDGE_TO', 'CUST_GEO_1', BASE_TIME, 'DEV_G1', 'London'),
+        ('GEO_PAST_FROM', 'CUST_GEO_2', BASE_TIME - timedelta(hours=2, seconds=1), 'DEV_G2', 'Paris'),
+        ('GEO_PAST_TO', 'CUST_GEO_2', BASE_TIME, 'DEV_G2', 'London'),
+        ('GEO_SAME_A', 'CUST_GEO_3', BASE_TIME, 'DEV_G3', 'Paris'),
+        ('GEO_SAME_B', 'CUST_GEO_3', BASE_TIME, 'DEV_G3', 'London')
+    ])
+    
+    rules = batch_rules(engine, transactions)
+    # Only strictly earlier transactions, from the window start on, count as the previous location
+    assert rules == {'GEO_EDGE_TO': 'GEO_JUMP'}
+
+
+def test_device_sharing_window_edges(db_session, fraud_engine, monkeypatch):
+    """Test device sharing on the window start and for transactions without a device ID."""
+    engine = fraud_engine
+    monkeypatch.setattr(engine, 'session', db_session)
+    
+    rows = []
+    for device_id, oldest in (('DEV_EDGE', BASE_TIME - timedelta(days=7)),
+                              ('DEV_PAST', BASE_TIME - timedelta(days=7, seconds=1)),
+                              (None, BASE_TIME - timedelta(days=1))):
+        name = device_id or 'DEV_NONE'
+        rows += [
+            (f'{name}_A', f'{name}_CUST_A', oldest, device_id, 'NYC'),
+            (f'{name}_B', f'{name}_CUST_B', BASE_TIME - timedelta(days=3), device_id, 'NYC'),
+            (f'{name}_C', f'{name}_CUST_C', BASE_TIME, device_id, 'NYC')
+        ]
+    transactions = add_transactions(db_session, rows)
+    
+    rules = batch_rules(engine, transactions)
+    # Transactions without a device ID count as one device, like the baseline's device_id IS NULL query
+    assert rules == {'DEV_EDGE_C': 'DEVICE_SHARING', 'DEV_NONE_C': 'DEVICE_SHARING'}
+
+
+def test_batch_uses_history_outside_batch(db_session, fraud_engine, monkeypatch):
+    """Test that a batch's windows include earlier transactions that are not in the batch."""
+    engine = fraud_engine
+    monkeypatch.setattr(engine, 'session', db_session)
+    
+    transactions = add_transactions(db_session, [
+        (f'HIST_{i}', 'CUST_HIST', BASE_TIME - timedelta(minutes=10 * (i + 1)), 'DEV_H', 'NYC')
+        for i in range(5)
+    ] + [
+        ('HIST_NEW', 'CUST_HIST', BASE_TIME, 'DEV_H', 'Boston')
+    ])
+    
+    rules = batch_rules(engine, transactions[-1:])
+    assert rules == {'HIST_NEW': 'VELOCITY, GEO_JUMP'}
 
 
 if __name__ == '__main__':
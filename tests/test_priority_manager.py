@@ -0,0 +1,74 @@
+"""Unit tests for alert prioritization and SLA tracking."""
+import pytest
+import pandas as pd
+from fraud_alert_system.database import Base, Alert
+from fraud_alert_system.priority_manager import (
+    calculate_priority_score, get_sla_status, get_time_to_sla, get_sla_thresholds,
+    calculate_priority_scores, get_sla_statuses, get_times_to_sla, past_sla_condition
+)
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+
+NOW = datetime(2024, 1, 15, 12, 0)
+
+
+@pytest.fixture
+def alerts():
+    """Alerts of every severity at ages around their SLA threshold, including exactly on it."""
+    alerts = []
+    for severity in ('CRITICAL', 'HIGH', 'MEDIUM', 'LOW', 'UNKNOWN'):
+        sla_minutes = get_sla_thresholds().get(severity, 1440)
+        for fraction in (0, 0.5, 0.8, 0.9, 1, 1.5, 3):
+            alerts.append(Alert(
+                alert_id=f'ALT_{severity}_{fraction}',
+                transaction_id=f'TXN_{severity}_{fraction}',
+                rule_triggered='HIGH_AMOUNT',
+                severity=severity,
+                risk_score=10 + 2.5 * len(alerts),
+                created_at=NOW - timedelta(minutes=sla_minutes * fraction)
+            ))
+    return alerts
+
+
+def alert_columns(alerts):
+    """The severity, risk_score and created_at Series the vectorized functions take."""
+    return (
+        pd.Series([alert.severity for alert in alerts], dtype=object),
+        pd.Series([alert.risk_score for alert in alerts], dtype=float),
+        pd.Series([alert.created_at for alert in alerts], dtype='datetime64[ns]')
+    )
+
+
+def test_priority_scores_match_scalar(alerts):
+    """Test the vectorized priority scores against calculate_priority_score."""
+    severity, risk_score, created_at = alert_columns(alerts)
+    
+    scores = calculate_priority_scores(severity, risk_score, created_at, NOW)
+    assert list(scores) == pytest.approx([calculate_priority_score(alert, NOW) for alert in alerts])
+
+
+def test_sla_statuses_match_scalar(alerts):
+    """Test the vectorized SLA statuses and times against get_sla_status and get_time_to_sla."""
+    severity, _, created_at = alert_columns(alerts)
+    
+    assert list(get_sla_statuses(severity, created_at, NOW)) == [get_sla_status(alert, NOW) for alert in alerts]
+    assert list(get_times_to_sla(severity, created_at, NOW)) == pytest.approx(
+        [get_time_to_sla(alert, NOW) for alert in alerts]
+    )
+
+
+def test_past_sla_condition_matches_scalar(alerts):
+    """Test that past_sla_condition selects the alerts get_sla_status reports as PAST_SLA."""
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all(alerts)
+        session.flush()
+        
+        past_sla = session.query(Alert.alert_id).filter(past_sla_condition(NOW)).all()
+        assert {alert_id for alert_id, in past_sla} == {
+            alert.alert_id for alert in alerts if get_sla_status(alert, NOW) == 'PAST_SLA'
+        }
+    engine.dispose()